@@ -1,5 +1,7 @@
-def readInput():
-    data = open("2024/Day01/input.txt", "r")
+import numpy as np
+
+def readInput(filename: str):
+    data = open("2024/Day01/" + filename + ".txt", "r")
     lines = data.readlines()
 
     left = []
@@ -33,6 +35,34 @@ def solveTask2(left, right):
         score += el * appearances.get(el, 0)
     print(score)
 
-(left, right) = readInput()
-solveTask1(left, right)
-solveTask2(left, right)
\ No newline at end of file
+
+
+def readInputVectorized(filename: str):
+    # both columns are read in bulk, whitespace separated, and split afterwards
+    values = np.fromfile("2024/Day01/" + filename + ".txt", dtype=np.int64, sep=" ")
+    columns = values.reshape(-1, 2)
+    return (columns[:, 0], columns[:, 1])
+
+
+
+def solveTask1Vectorized(left, right):
+    distance = np.abs(np.sort(left) - np.sort(right)).sum()
+    print(int(distance))
+
+
+
+def solveTask2Vectorized(left, right):
+    values, counts = np.unique(right, return_counts=True)
+    if len(values) == 0:
+        print(0)
+        return
+    # for each left value look up the count of the same value on the right, if it appears there
+    index = np.minimum(np.searchsorted(values, left), len(values) - 1)
+    appearances = np.where(values[index] == left, counts[index], 0)
+    score = (left * appearances).sum()
+    print(int(score))
+
+if __name__ == "__main__":
+    (left, right) = readInputVectorized("input")
+    solveTask1Vectorized(left, right)
+    solveTask2Vectorized(left, right)
@@ -1,8 +1,10 @@
-def readInput():
+import numpy as np
+
+def readInput(filename: str):
     """
     Parses the input file.
     """
-    data = open("2024/Day02/input.txt", "r")
+    data = open("2024/Day02/" + filename + ".txt", "r")
     lines = data.readlines()
     reports = []
     for l in lines:
@@ -37,26 +39,103 @@ def solveTask1(reports):
             sum += 1
     print(sum)
 
-def checkReportModified(r: list[int], remove: int) -> bool:
+def isStepValid(diff: int, increasing: bool) -> bool:
+    """
+    Checks if the difference between two neighboring numbers is valid for the given direction.
+    """
+    if increasing:
+        return diff >= 1 and diff <= 3
+    return diff >= -3 and diff <= -1
+
+def checkReportDampened(r: list[int]) -> bool:
     """
-    Checks the validity of a report after removing the element with the given index.
+    Checks in a single pass without copying if a report is valid after removing at most one element.
+    For each direction three states are tracked after every element: the report is valid so far without
+    removals (keep), an element before the current one was removed (removedBefore) or the current element
+    is the removed one (removedCurrent).
     """
-    copy = r.copy()
-    copy.pop(remove)
-    return checkReport(copy) == -1
+    keepInc, removedBeforeInc, removedCurrentInc = True, False, True
+    keepDec, removedBeforeDec, removedCurrentDec = True, False, True
+    for i in range(1, len(r)):
+        diff = r[i] - r[i-1]
+        # the first element can always be removed, otherwise the element before the previous one
+        # becomes the neighbor if the previous one is removed
+        skipDiff = r[i] - r[i-2] if i > 1 else None
+        stepInc = isStepValid(diff, True)
+        skipInc = skipDiff == None or isStepValid(skipDiff, True)
+        keepInc, removedBeforeInc, removedCurrentInc = keepInc and stepInc, (removedBeforeInc and stepInc) or (removedCurrentInc and skipInc), keepInc
+        stepDec = isStepValid(diff, False)
+        skipDec = skipDiff == None or isStepValid(skipDiff, False)
+        keepDec, removedBeforeDec, removedCurrentDec = keepDec and stepDec, (removedBeforeDec and stepDec) or (removedCurrentDec and skipDec), keepDec
+        if not (removedBeforeInc or removedCurrentInc or removedBeforeDec or removedCurrentDec):
+            return False
+    return keepInc or removedBeforeInc or removedCurrentInc or keepDec or removedBeforeDec or removedCurrentDec
 
 def solveTask2(reports: list[list[int]]): 
     """
-    Checks each record and, if a record is invalid, tries again with the first element or any element in the collision removed.
+    Checks each record and counts the records that are valid with at most one element removed.
     """   
     sum = 0
     for r in reports:
-        result = checkReport(r)
-        if result == -1:
-            sum += 1
-        elif checkReportModified(r, 0) or checkReportModified(r, result-1) or checkReportModified(r, result):
+        if checkReportDampened(r):
             sum += 1
     print(sum)        
 
-reports = readInput()
-solveTask2(reports)
\ No newline at end of file
+def groupReportsByLength(reports: list[list[int]]) -> dict[int, np.ndarray]:
+    """
+    Groups the reports by their length. Returns a 2-D array with one report per row for each length.
+    """
+    groups: dict[int, list[list[int]]] = {}
+    for r in reports:
+        if not len(r) in groups:
+            groups[len(r)] = []
+        groups[len(r)].append(r)
+    return {length: np.array(group, dtype=np.int64) for length, group in groups.items()}
+
+def checkReportsBatch(reports: np.ndarray, dampened = False) -> np.ndarray:
+    """
+    Checks many reports of the same length at once. Each row of the 2-D array is a report.
+    Returns a boolean array indicating which reports are valid. If dampened is set, the same states as
+    in checkReportDampened are tracked for all reports at once.
+    """
+    diffs = np.diff(reports, axis=1)
+    stepsInc = (diffs >= 1) & (diffs <= 3)
+    stepsDec = (diffs >= -3) & (diffs <= -1)
+    if not dampened:
+        return stepsInc.all(axis=1) | stepsDec.all(axis=1)
+    skipDiffs = reports[:, 2:] - reports[:, :-2]
+    skipsInc = (skipDiffs >= 1) & (skipDiffs <= 3)
+    skipsDec = (skipDiffs >= -3) & (skipDiffs <= -1)
+    valid = np.zeros(len(reports), dtype=bool)
+    for steps, skips in [(stepsInc, skipsInc), (stepsDec, skipsDec)]:
+        keep = np.ones(len(reports), dtype=bool)
+        removedBefore = np.zeros(len(reports), dtype=bool)
+        removedCurrent = np.ones(len(reports), dtype=bool)
+        for i in range(1, reports.shape[1]):
+            step = steps[:, i-1]
+            skip = skips[:, i-2] if i > 1 else True
+            keep, removedBefore, removedCurrent = keep & step, (removedBefore & step) | (removedCurrent & skip), keep
+        valid |= keep | removedBefore | removedCurrent
+    return valid
+
+def solveTask1Batch(reports: list[list[int]]):
+    """
+    Solves task 1 by checking all reports of the same length at once.
+    """
+    sum = 0
+    for group in groupReportsByLength(reports).values():
+        sum += int(checkReportsBatch(group).sum())
+    print(sum)
+
+def solveTask2Batch(reports: list[list[int]]):
+    """
+    Solves task 2 by checking all reports of the same length at once.
+    """
+    sum = 0
+    for group in groupReportsByLength(reports).values():
+        sum += int(checkReportsBatch(group, True).sum())
+    print(sum)
+
+if __name__ == "__main__":
+    reports = readInput("input")
+    solveTask2(reports)
@@ -1,10 +1,10 @@
 import re
 
-def readInput() -> list[str]:
+def readInput(filename: str) -> list[str]:
     """
     Parses the input file using regex, extracts all commands.
     """
-    data = open("2024/Day03/input.txt", "r")
+    data = open("2024/Day03/" + filename + ".txt", "r")
     mulPat = "mul\\(\\d{1,3},\\d{1,3}\\)" # finds all mul(xxx, yyy)
     dontPat = "don't\\(\\)"
     doPat = "do\\(\\)"
@@ -28,6 +28,62 @@ def runProgram(p: list[str], allowControlFlow = False) -> int:
             enabled = True
     return sum
 
+# same instructions as in readInput, with groups for the factors and the control flow commands
+INSTRUCTION_PATTERN = re.compile("mul\\((\\d{1,3}),(\\d{1,3})\\)|(don't\\(\\))|(do\\(\\))")
+MAX_INSTRUCTION_LENGTH = len("mul(123,456)")
+
+def runProgramStreaming(filename: str, allowControlFlow = False, chunkSize = 1 << 20) -> int:
+    """
+    Executes the program while reading the input file in chunks, so memory stays constant for any file size.
+    Instructions starting within the last few characters of a chunk might be incomplete. They are kept and
+    scanned again together with the next chunk.
+    """
+    data = open("2024/Day03/" + filename + ".txt", "r")
+    sum = 0
+    enabled = True
+    buffer = ""
+    while True:
+        chunk = data.read(chunkSize)
+        buffer += chunk
+        # any instruction starting before the cutoff fits into the buffer completely
+        cutoff = len(buffer) - MAX_INSTRUCTION_LENGTH + 1
+        if chunk == "":
+            cutoff = len(buffer)
+        end = 0
+        for match in INSTRUCTION_PATTERN.finditer(buffer):
+            if match.start() >= cutoff:
+                break
+            end = match.end()
+            if match.group(1) != None and enabled:
+                sum += int(match.group(1)) * int(match.group(2))
+            elif match.group(3) != None and allowControlFlow:
+                enabled = False
+            elif match.group(4) != None:
+                enabled = True
+        if chunk == "":
+            break
+        buffer = buffer[max(cutoff, end):]
+    data.close()
+    return sum
+
+def readInputStreaming(filename: str) -> str:
+    """
+    Does not parse anything. The streaming tasks read the input file themselves.
+    """
+    return filename
+
+def solveTask1Streaming(filename: str):
+    """
+    Solves the first task by streaming the program and ignoring the do() and don't() commands.
+    """
+    print(runProgramStreaming(filename))
+
+def solveTask2Streaming(filename: str):
+    """
+    Solves the second task by streaming the program and executing all commands.
+    """
+    print(runProgramStreaming(filename, True))
+
 def solveTask1(p: list[str]):
     """
     Solves the first task by running the program and ignoring the do() and don't() commands.
@@ -40,5 +96,6 @@ def solveTask2(p: list[str]):
     """
     print(runProgram(p, True))
 
-prog = readInput()
-solveTask2(prog)
\ No newline at end of file
+if __name__ == "__main__":
+    prog = readInput("input")
+    solveTask2(prog)
@@ -1,8 +1,10 @@
-def readInput() -> list[str]:
+import numpy as np
+
+def readInput(filename: str) -> list[str]:
     """
     Parses the input file. Returnes an array of lines.
     """
-    data = open("2024/Day04/input.txt", "r")
+    data = open("2024/Day04/" + filename + ".txt", "r")
     lines = data.readlines()
     return lines
 
@@ -61,6 +63,59 @@ def solveTask2(lines: list[str]):
                 found += 1
     print(found)
 
+def readInputVectorized(filename: str) -> np.ndarray:
+    """
+    Parses the input file into a 2-D array of characters (as bytes).
+    """
+    data = open("2024/Day04/" + filename + ".txt", "rb")
+    lines = data.read().split()
+    if len(set(map(len, lines))) > 1:
+        raise ValueError("All lines of the grid must have the same length.")
+    return np.frombuffer(b"".join(lines), dtype=np.uint8).reshape(len(lines), -1)
+
+def countWordInDirection(grid: np.ndarray, word: str, dL: int, dC: int) -> int:
+    """
+    Counts how often the given word appears in the given direction by comparing shifted views of the grid.
+    Only start positions that keep the whole word inside the grid are considered.
+    """
+    n = len(word) - 1
+    lStart, lEnd = max(0, -n * dL), grid.shape[0] - max(0, n * dL)
+    cStart, cEnd = max(0, -n * dC), grid.shape[1] - max(0, n * dC)
+    if lStart >= lEnd or cStart >= cEnd:
+        return 0
+    found = np.ones((lEnd - lStart, cEnd - cStart), dtype=bool)
+    for i in range(len(word)):
+        shifted = grid[lStart + i*dL:lEnd + i*dL, cStart + i*dC:cEnd + i*dC]
+        found &= shifted == ord(word[i])
+    return int(found.sum())
+
+def solveTask1Vectorized(grid: np.ndarray):
+    """
+    Solves the first task by counting XMAS in all eight directions on the whole grid at once.
+    """
+    found = 0
+    for dL in [-1, 0, 1]:
+        for dC in [-1, 0, 1]:
+            if dL != 0 or dC != 0:
+                found += countWordInDirection(grid, "XMAS", dL, dC)
+    print(found)
+
+def solveTask2Vectorized(grid: np.ndarray):
+    """
+    Solves the second task by checking both diagonals around every A on the whole grid at once.
+    """
+    if grid.shape[0] < 3 or grid.shape[1] < 3:
+        print(0)
+        return
+    m, s = ord("M"), ord("S")
+    topLeft, bottomRight = grid[:-2, :-2], grid[2:, 2:]
+    topRight, bottomLeft = grid[:-2, 2:], grid[2:, :-2]
+    diagonal = ((topLeft == m) & (bottomRight == s)) | ((topLeft == s) & (bottomRight == m))
+    antiDiagonal = ((topRight == m) & (bottomLeft == s)) | ((topRight == s) & (bottomLeft == m))
+    found = (grid[1:-1, 1:-1] == ord("A")) & diagonal & antiDiagonal
+    print(int(found.sum()))
 
-data = readInput()
-solveTask2(data)
\ No newline at end of file
+if __name__ == "__main__":
+    grid = readInputVectorized("input")
+    solveTask1Vectorized(grid)
+    solveTask2Vectorized(grid)
@@ -1,3 +1,4 @@
+import heapq
 import math
 
 def parseRule(rule: str) -> tuple[int, int]:
@@ -47,21 +48,45 @@ def compileRules(rules: list[tuple[int, int]]) -> dict[int, set[int]]:
         result[first].add(after)
     return result
 
-def checkUpdate(compiled: dict[int, set[int]], update: list[int]) -> tuple[int, int] | None:
+def getRanks(compiled: dict[int, set[int]], update: list[int]) -> dict[int, int]:
     """
-    Checks the given update against the rules. Returns a tuple of indices of conflicting numbers or None,
-    if no such conflicts exist.
+    Ranks the pages of an update using Kahn's algorithm on the rules restricted to these pages.
+    Among the pages that are free to go next the one that comes first in the update is picked, so a valid
+    update is ranked in its own order. Raises a ValueError if the restricted rules contain a cycle.
     """
+    pages = set(update)
+    if len(pages) != len(update):
+        raise ValueError(f"Update {update} contains a page more than once.")
+    position = {}
     for i in range(len(update)):
-        n = update[i]
-        if not n in compiled:
-            continue
-        rule = compiled[n]
-        for j in range(i):
-            b = update[j]
-            if b in rule:
-                return (i, j)
-    return None
+        position[update[i]] = i
+    after: dict[int, set[int]] = {}
+    incoming = dict.fromkeys(update, 0)
+    for n in update:
+        after[n] = compiled.get(n, set()) & pages
+        for a in after[n]:
+            incoming[a] += 1
+    queue = [position[n] for n in update if incoming[n] == 0]
+    heapq.heapify(queue)
+    ranks: dict[int, int] = {}
+    while len(queue) > 0:
+        n = update[heapq.heappop(queue)]
+        ranks[n] = len(ranks)
+        for a in after[n]:
+            incoming[a] -= 1
+            if incoming[a] == 0:
+                heapq.heappush(queue, position[a])
+    if len(ranks) != len(update):
+        cycle = sorted(n for n in update if not n in ranks)
+        raise ValueError(f"Rules for update {update} contain a cycle between the pages {cycle}.")
+    return ranks
+
+def sortUpdate(compiled: dict[int, set[int]], update: list[int]) -> list[int]:
+    """
+    Returns the update sorted according to the rules. The update is valid if it is already sorted.
+    """
+    ranks = getRanks(compiled, update)
+    return sorted(update, key=ranks.__getitem__)
 
 def solveTask1(rules: list[tuple[int, int]], updates: list[list[int]]):
     """
@@ -70,30 +95,24 @@ def solveTask1(rules: list[tuple[int, int]], updates: list[list[int]]):
     compiled = compileRules(rules)
     sum = 0
     for u in updates:
-        if not checkUpdate(compiled, u):
+        if sortUpdate(compiled, u) != u:
             continue
         sum += u[math.floor(len(u)/2)]
     print(sum)
 
 def solveTask2(rules: list[tuple[int, int]], updates: list[list[int]]):
     """
-    Solves task 2 by checking all updates against the ruleset. On invalid updates the problematic numbers
-    are switched until all confilcts are resolved.
+    Solves task 2 by sorting all updates according to the ruleset and summing up the invalid ones.
     """
     compiled = compileRules(rules)
     sum = 0
     for u in updates:
-        problem = checkUpdate(compiled, u)
-        if problem == None:
+        sortedUpdate = sortUpdate(compiled, u)
+        if sortedUpdate == u:
             continue
-        while problem != None:
-            temp = u[problem[0]]
-            u[problem[0]] = u[problem[1]]
-            u[problem[1]] = temp
-            problem = checkUpdate(compiled, u)
-        sum += u[math.floor(len(u)/2)]
+        sum += sortedUpdate[math.floor(len(u)/2)]
     print(sum)
 
-    
-rules, updates = readInput("input")
-solveTask2(rules, updates)
+if __name__ == "__main__":
+    rules, updates = readInput("input")
+    solveTask2(rules, updates)
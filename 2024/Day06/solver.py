@@ -1,24 +1,12 @@
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
+import os
 
 class Tile(Enum):
     OBSTACLE = 0
     FREE = 1
     OUT = -1
 
-class Direction:
-    def __init__(self, dX: int, dY: int) -> None:
-        """
-        Creates a new Direction with an x and y component.
-        """
-        self.dX = dX
-        self.dY = dY
-
-    def rotate(self):
-        """
-        Rotates the direction by 90 degrees clockwise.
-        """
-        self.dX, self.dY = -self.dY, self.dX
-
 class Pos:
     def __init__(self, x: int, y: int) -> None:
         """
@@ -27,12 +15,6 @@ class Pos:
         self.x = x
         self.y = y
 
-    def next(self, dir: Direction):
-        """
-        Returns a new position representing one step from the current position in the given direction.
-        """
-        return Pos(self.x + dir.dX, self.y + dir.dY)
-    
     def __hash__(self) -> int:
         """
         Returns a hash by constructing a tuple and using it's hash method.
@@ -53,6 +35,9 @@ class Map:
         Creates a new Map by parsing the given lines of strings.
         """
         map = []
+        lines = [l.rstrip("\n") for l in lines]
+        self.height = len(lines)
+        self.width = len(lines[0])
         for i in range(len(lines)):
             row = []
             for j in range(len(lines[i])):
@@ -92,42 +77,126 @@ def readInput(filename: str) -> Map:
         raise ValueError("Start position not found.")
     return map
 
-def getUniqueKey(pos: Pos, dir: Direction) -> str:
+# up, right, down, left, so turning right means going to the next direction
+DIRECTIONS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+
+class JumpTable:
+    def __init__(self, map: Map) -> None:
+        """
+        Precomputes for every cell and direction the cell where the guard stops in front of the next obstacle.
+        Cells are encoded as y * width + x, leaving the map is encoded as -1.
+        """
+        self.width = map.width
+        self.height = map.height
+        self._stops: list[list[int]] = []
+        for dX, dY in DIRECTIONS:
+            stops = [-1] * (self.width * self.height)
+            # each column or row is swept against the direction, so the obstacle ahead was already seen
+            outerRange = range(self.width) if dX == 0 else range(self.height)
+            for outer in outerRange:
+                innerRange = range(self.height) if dX == 0 else range(self.width)
+                if dX + dY > 0:
+                    innerRange = reversed(innerRange)
+                stop = -1
+                for inner in innerRange:
+                    x, y = (outer, inner) if dX == 0 else (inner, outer)
+                    if map.get(x, y) == Tile.OBSTACLE:
+                        stop = (y - dY) * self.width + x - dX
+                    else:
+                        stops[y * self.width + x] = stop
+            self._stops.append(stops)
+
+    def jump(self, cell: int, direction: int, obstacle = -1) -> int:
+        """
+        Returns the cell where the guard stops when walking from the given cell in the given direction or -1,
+        if the guard leaves the map. An additional obstacle can be placed at the given cell without changing the table.
+        """
+        stop = self._stops[direction][cell]
+        if obstacle < 0:
+            return stop
+        dX, dY = DIRECTIONS[direction]
+        x, y = cell % self.width, cell // self.width
+        oX, oY = obstacle % self.width, obstacle // self.width
+        if dX == 0:
+            distance = (oY - y) * dY
+            ahead = oX == x and distance > 0
+        else:
+            distance = (oX - x) * dX
+            ahead = oY == y and distance > 0
+        if not ahead:
+            return stop
+        if stop >= 0:
+            sX, sY = stop % self.width, stop // self.width
+            if (sX - x) * dX + (sY - y) * dY < distance:
+                return stop
+        return obstacle - dY * self.width - dX
+
+    def getCellsBetween(self, cell: int, stop: int, direction: int) -> range:
+        """
+        Returns all cells passed when walking from the given cell to the stop cell. If the stop is -1,
+        all cells up to the edge of the map are returned.
+        """
+        dX, dY = DIRECTIONS[direction]
+        if stop < 0:
+            x, y = cell % self.width, cell // self.width
+            if dX != 0:
+                x = self.width - 1 if dX > 0 else 0
+            else:
+                y = self.height - 1 if dY > 0 else 0
+            stop = y * self.width + x
+        step = dY * self.width + dX
+        return range(cell, stop + step, step)
+
+def getStartCell(map: Map) -> int:
     """
-    Creates a key for the given position and direction combination.
+    Returns the encoded cell of the start position.
     """
-    return str(pos.x) + "," + str(pos.y) + "," + str(dir.dX) + "," + str(dir.dY)
+    return map.pos.y * map.width + map.pos.x
 
-def findPath(map: Map) -> set[Pos] | None:
+def findPath(table: JumpTable, start: int) -> set[int] | None:
     """
-    Finds a path in the given map. Returns a set of all points on the path or None, if there is no path out of the map.
+    Finds a path in the given map. Returns a set of all cells on the path or None, if there is no path out of the map.
     """
-    direction = Direction(0, -1)
-    visited = set()
-    path = set()
-    start = map.pos
-    path.add(start)
-    visited.add(getUniqueKey(start, direction))
+    direction = 0
+    visited: set[int] = set()
+    path = {start}
+    cell = start
     while True:
-        next = start.next(direction)
-        if getUniqueKey(next, direction) in visited:
+        stop = table.jump(cell, direction)
+        path.update(table.getCellsBetween(cell, stop, direction))
+        if stop < 0:
+            return path
+        state = stop * 4 + direction
+        if state in visited:
             return None
-        tile = map.get(next.x, next.y)
-        if tile == Tile.OBSTACLE:
-            direction.rotate()
-        elif tile == Tile.FREE:
-            path.add(next)
-            visited.add(getUniqueKey(next, direction))
-            start = next
-        else:
-            break
-    return path
+        visited.add(state)
+        cell = stop
+        direction = (direction + 1) % 4
+
+def hasLoop(table: JumpTable, start: int, obstacle = -1) -> bool:
+    """
+    Checks if the guard walks in a loop when an additional obstacle is placed at the given cell.
+    Only the cells where the guard turns are recorded, encoded together with the direction as cell * 4 + direction.
+    """
+    direction = 0
+    visited: set[int] = set()
+    cell = start
+    while True:
+        stop = table.jump(cell, direction, obstacle)
+        if stop < 0:
+            return False
+        state = stop * 4 + direction
+        if state in visited:
+            return True
+        visited.add(state)
+        cell = stop
+        direction = (direction + 1) % 4
 
 def solveTask1(map: Map):
     """
     Solves the first task by finding the path out of the map.
     """
-    path = findPath(map)
+    path = findPath(JumpTable(map), getStartCell(map))
     if path != None:
         print(len(path))
     else:
@@ -138,18 +207,59 @@ def solveTask2(map: Map):
     Solves the second task by placing objects along the path from the first task and checking
     if the resulting map contains a looping path.
     """
-    path = findPath(map)
+    table = JumpTable(map)
+    start = getStartCell(map)
+    path = findPath(table, start)
     if path == None:
         print("Loop found in initial path")
         return
     result = 0
-    for pos in path:
-        map.set(pos.x, pos.y, Tile.OBSTACLE)
-        path = findPath(map)
-        if path == None:
+    for cell in path:
+        if hasLoop(table, start, cell):
             result += 1
-        map.set(pos.x, pos.y, Tile.FREE)
     print(result)
 
-map = readInput("input")
-solveTask2(map)
\ No newline at end of file
+workerTable: JumpTable
+workerStart: int
+
+def initWorker(table: JumpTable, start: int):
+    """
+    Stores the read-only jump table and the start cell in a worker process.
+    """
+    global workerTable, workerStart
+    workerTable = table
+    workerStart = start
+
+def countLoops(candidates: list[int]) -> int:
+    """
+    Counts the candidate obstacles that make the guard walk in a loop. Runs in a worker process.
+    """
+    result = 0
+    for cell in candidates:
+        if hasLoop(workerTable, workerStart, cell):
+            result += 1
+    return result
+
+def solveTask2Parallel(map: Map, workers: int | None = None):
+    """
+    Solves the second task like solveTask2, but splits the candidate obstacles across a process pool.
+    Each worker holds its own copy of the jump table and only places one obstacle at a time on top of it.
+    """
+    table = JumpTable(map)
+    start = getStartCell(map)
+    path = findPath(table, start)
+    if path == None:
+        print("Loop found in initial path")
+        return
+    if workers == None:
+        workers = os.cpu_count() or 1
+    candidates = sorted(path)
+    chunkSize = max(1, len(candidates) // (workers * 4))
+    chunks = [candidates[i:i + chunkSize] for i in range(0, len(candidates), chunkSize)]
+    with ProcessPoolExecutor(workers, initializer=initWorker, initargs=(table, start)) as pool:
+        result = sum(pool.map(countLoops, chunks))
+    print(result)
+
+if __name__ == "__main__":
+    map = readInput("input")
+    solveTask2(map)
@@ -20,30 +20,43 @@ def readInput(filename: str) -> list[Equation]:
         equations.append(eq)
     return equations
 
+def getConcatFactor(n: int) -> int:
+    """
+    Returns the power of ten that a number has to be multiplied with before n can be concatenated to it.
+    """
+    factor = 10
+    while factor <= n:
+        factor *= 10
+    return factor
+
+def canReach(numbers: list[int], index: int, target: int, allowConcat: bool) -> bool:
+    """
+    Checks if the target can be reached with the numbers up to the given index by undoing the last operator.
+    Addition is undone by subtraction, multiplication by exact division and concatenation by cutting off
+    the trailing digits, so every branch that can not lead to a solution is pruned right away.
+    """
+    n = numbers[index]
+    if index == 0:
+        return target == n
+    if target >= n and canReach(numbers, index - 1, target - n, allowConcat):
+        return True
+    if n == 0:
+        if target == 0:
+            return True
+    elif target % n == 0 and canReach(numbers, index - 1, target // n, allowConcat):
+        return True
+    if allowConcat:
+        factor = getConcatFactor(n)
+        if target % factor == n and canReach(numbers, index - 1, target // factor, allowConcat):
+            return True
+    return False
+
 def solveEquation(equation: Equation, allowConcat = False) -> bool:
     """
     Tries to solve the given equation using addition and multiplication. If the allowConcat flag is set,
-    concationation is allowed as a third operator.
+    concationation is allowed as a third operator. The search works backwards from the result.
     """
-    bases = [equation.numbers[0]]
-    for current in range(1, len(equation.numbers)):
-        nextBases = []
-        for b in bases:
-            if b > equation.result:
-                continue
-            currentN = equation.numbers[current]
-            added = b + currentN
-            multed = b * currentN
-            nextBases.append(added)
-            nextBases.append(multed)
-            concat = 0
-            if allowConcat:
-                concat = int(str(b) + str(currentN))
-            nextBases.append(concat)
-            if current == len(equation.numbers)-1 and (added == equation.result or multed == equation.result or concat == equation.result):
-                return True
-        bases = nextBases
-    return False
+    return canReach(equation.numbers, len(equation.numbers) - 1, equation.result, allowConcat)
 
 
 def solveTask1(equations: list[Equation]):
@@ -66,5 +79,6 @@ def solveTask2(equations: list[Equation]):
             sum += eq.result
     print(sum)
 
-equations = readInput("input")
-solveTask2(equations)
+if __name__ == "__main__":
+    equations = readInput("input")
+    solveTask2(equations)
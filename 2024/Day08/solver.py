@@ -1,3 +1,5 @@
+import math
+
 class Pos:
     def __init__(self, x, y):
         """
@@ -6,12 +8,6 @@ class Pos:
         self.x = x
         self.y = y
 
-    def diff(self, other):
-        """
-        Returns the difference of the two positions.
-        """
-        return Pos(self.x - other.x, self.y - other.y)
-    
     def __eq__(self, value):
         """
         Checks if two positions are equal.
@@ -44,64 +40,65 @@ def readInput(filename: str):
             antennas[char].append(Pos(x, y))
     return (antennas, Pos(len(lines[0])-1, len(lines)))
 
-def isInBounds(pos: Pos, dim: Pos):
+def isInBounds(x: int, y: int, dim: Pos):
     """
-    Checks if the given position is within the board bounds.
+    Checks if the given coordinates are within the board bounds.
     """
-    return pos.x >= 0 and pos.x < dim.x and pos.y >= 0 and pos.y < dim.y
+    return x >= 0 and x < dim.x and y >= 0 and y < dim.y
 
-def findAntinodes(antenna1: Pos, antenna2: Pos, antinodes: set[Pos], dim: Pos, wholeLine = False):
+def markAntinodes(antenna1: Pos, antenna2: Pos, antinodes: bytearray, dim: Pos, wholeLine = False):
     """
-    Finds the antinodes created by the two antennas. Antinodes are added to the given set.
-    If wholeLine ist set, all antinodes on the line are found, otherwise only the closest two.
+    Marks the antinodes created by the two antennas in the given bitmap, which has one entry per cell at y * dim.x + x.
+    If wholeLine ist set, all antinodes on the line are marked, otherwise only the closest two.
     """
-    diff = antenna1.diff(antenna2)
-    antinodes.add(antenna1)
-    while True:
-        antenna1 = Pos(antenna1.x + diff.x, antenna1.y + diff.y)
-        if isInBounds(antenna1, dim):
-            antinodes.add(antenna1)
-        else:
-            break
-        if not wholeLine:
-            break
-    antinodes.add(antenna2)
-    while True:
-        antenna2 = Pos(antenna2.x - diff.x, antenna2.y - diff.y)
-        if isInBounds(antenna2, dim):
-            antinodes.add(antenna2)
-        else:
-            break
-        if not wholeLine:
-            break
+    dX = antenna1.x - antenna2.x
+    dY = antenna1.y - antenna2.y
+    if not wholeLine:
+        for x, y in [(antenna1.x + dX, antenna1.y + dY), (antenna2.x - dX, antenna2.y - dY)]:
+            if isInBounds(x, y, dim):
+                antinodes[y * dim.x + x] = 1
+        return
+    # every grid position on the line counts, so the step is reduced to the smallest one
+    divisor = math.gcd(dX, dY)
+    dX //= divisor
+    dY //= divisor
+    for sign in [1, -1]:
+        x = antenna1.x
+        y = antenna1.y
+        if sign < 0:
+            x -= dX
+            y -= dY
+        while isInBounds(x, y, dim):
+            antinodes[y * dim.x + x] = 1
+            x += sign * dX
+            y += sign * dY
 
-def findAllAntinodes(antennas: list[Pos], antinodes: set[Pos], dim: Pos, wholeLine = False):
+def findAllAntinodes(antennas: list[Pos], antinodes: bytearray, dim: Pos, wholeLine = False):
     """
-    Finds all antinodes created by a list of antennas of the same frequency.
+    Finds all antinodes created by a list of antennas of the same frequency. Each pair of antennas is visited once.
     """
     for i in range(len(antennas)):
-        for j in range(len(antennas)):
-            if i == j:
-                continue
-            findAntinodes(antennas[i], antennas[j], antinodes, dim, wholeLine)
+        for j in range(i + 1, len(antennas)):
+            markAntinodes(antennas[i], antennas[j], antinodes, dim, wholeLine)
 
 def solveTask1(antennas: dict[str, list[Pos]], dim: Pos):
     """
     Solves task 1 by iterating over all antenna pairs and finding the two closest antinodes.
     """
-    antinodes = set()
+    antinodes = bytearray(dim.x * dim.y)
     for type in antennas:
         findAllAntinodes(antennas[type], antinodes, dim)
-    print(len(antinodes))
+    print(antinodes.count(1))
 
 def solveTask2(antennas, dim):
     """
     Solves task 2 by iterating over all antenna pairs and finding all antinodes on the line.
     """
-    antinodes = set()
+    antinodes = bytearray(dim.x * dim.y)
     for type in antennas:
         findAllAntinodes(antennas[type], antinodes, dim, True)
-    print(len(antinodes))
+    print(antinodes.count(1))
 
-antennas, dim = readInput("input")
-solveTask2(antennas, dim)
\ No newline at end of file
+if __name__ == "__main__":
+    antennas, dim = readInput("input")
+    solveTask2(antennas, dim)
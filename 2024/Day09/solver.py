@@ -1,121 +1,110 @@
-from typing import cast
+import heapq
 
-class File:
-    def __init__(self, id: int, size: int) -> None:
+class SpaceIndex:
+    def __init__(self) -> None:
         """
-        Creates a new File with an id and size.
+        Creates a new index of free spaces with one min-heap of offsets per space size (1-9).
         """
-        self.id = id
-        self.size = size
+        self._heaps: list[list[int]] = [[] for _ in range(10)]
 
-class Space:
-    def __init__(self, size: int) -> None:
+    def add(self, offset: int, size: int):
         """
-        Creates a new Space with given size.
+        Adds a free space at the given offset.
         """
-        self.size = size
+        if size > 0:
+            heapq.heappush(self._heaps[size], offset)
 
-def readInput(filename: str) -> list[File | Space]:
-    """
-    Parses the input file.
-    """
-    data = open("2024/Day09/" + filename + ".txt", "r")
-    lines = data.readlines()
-    if len(lines) != 1:
-        raise ValueError("Input should only be one line.")
-    disk = []
-    for i in range(len(lines[0])):
-        if i % 2 == 0:
-            disk.append(File(int(i / 2), int(lines[0][i])))
-        else:
-            disk.append(Space(int(lines[0][i])))
-    return disk
-
-def getNextNonEmptyFileFromBack(disk: list[File | Space], right: int) -> int:
-    """
-    Returns the index of a non empty file to the left of the given index from left to right.
-    """
-    while isinstance(disk[right], Space) or disk[right].size == 0:
-        right -= 1
-    return right
+    def takeFirst(self, size: int, limit: int) -> int | None:
+        """
+        Finds the left-most space with at least the given size that starts before the limit and fills it.
+        The rest of the space stays in the index. Returns the offset of the space or None, if no such space exists.
+        """
+        best = None
+        for s in range(size, len(self._heaps)):
+            heap = self._heaps[s]
+            if len(heap) > 0 and heap[0] < limit and (best == None or heap[0] < self._heaps[best][0]):
+                best = s
+        if best == None:
+            return None
+        offset = heapq.heappop(self._heaps[best])
+        self.add(offset + size, best - size)
+        return offset
 
-def createFileToFillSpace(space: Space, right: int) -> tuple[File, int]:
-    """
-    Creates a new file to fill the given space. The data is taken from the next non-empty file to the left of 
-    the given index. The file size is updated.
-    The new right index is returned with the created file.
-    """
-    right = getNextNonEmptyFileFromBack(disk, right)
-    currentRight = cast(File, disk[right])
-    amount = min(space.size, currentRight.size)
-    currentRight.size -= amount
-    space.size -= amount
-    return (File(currentRight.id, amount), right)
+DIGITS = bytes.maketrans(b"0123456789", bytes(range(10)))
 
-def calculateChecksum(disk: list[File | Space]) -> int:
+def readInput(filename: str) -> bytes:
     """
-    Calculates the checksum of the given disk.
+    Parses the input file. Returns the disk map with one byte per digit holding the digit's value.
     """
-    sum = 0
-    offset = 0
-    for f in disk:
-        if isinstance(f, Space):
-            offset += f.size
-            continue
-        for i in range(f.size):
-            sum += f.id * (offset + i)
-        offset += f.size
-    return sum
+    data = open("2024/Day09/" + filename + ".txt", "rb")
+    line = data.read().strip()
+    if not line.isdigit():
+        raise ValueError("Input should only be one line of digits.")
+    return line.translate(DIGITS)
 
-def findFirstSpace(disk: list[File | Space], size: int, limit: int):
+def getFileChecksum(id: int, offset: int, size: int) -> int:
     """
-    Finds the left-most space with at least the given size.
+    Calculates the checksum of a single file using the sum of the block positions offset to offset + size - 1.
     """
-    for i in range(limit):
-        candidate = disk[i]
-        if isinstance(candidate, Space) and candidate.size >= size:
-            return i
+    return id * (offset * size + size * (size - 1) // 2)
 
-def solveTask1(disk: list[File | Space]):
+def solveTask1(diskMap: bytes):
     """
-    Solves task one by filling all empty spaces from left to right with files from right to left.
+    Solves task one by filling all empty spaces from left to right with blocks of the files from right to left.
+    Two pointers walk the disk map and the checksum is summed up directly while blocks are moved.
     """
-    sorted: list[File | Space ] = []
+    sum = 0
+    position = 0
     left = 0
-    right = len(disk) - 1
+    right = len(diskMap) - 1
+    if right % 2 == 1:
+        right -= 1
+    rightRemaining = diskMap[right]
     while left < right:
-        currentLeft = disk[left]
-        if isinstance(currentLeft, File):
-            sorted.append(currentLeft)
+        if left % 2 == 0:
+            size = diskMap[left]
+            sum += getFileChecksum(left // 2, position, size)
+            position += size
         else:
-            while currentLeft.size > 0:
-                newFile, right = createFileToFillSpace(currentLeft, right)
-                sorted.append(newFile)            
+            space = diskMap[left]
+            while space > 0 and left < right:
+                amount = min(space, rightRemaining)
+                sum += getFileChecksum(right // 2, position, amount)
+                position += amount
+                space -= amount
+                rightRemaining -= amount
+                if rightRemaining == 0:
+                    right -= 2
+                    rightRemaining = diskMap[right]
         left += 1
-    remaining = disk[left].size
-    if remaining > 0:
-        sorted[-1].size += remaining
-    print(calculateChecksum(sorted))
+    if left == right:
+        sum += getFileChecksum(right // 2, position, rightRemaining)
+    print(sum)
 
-def solveTask2(disk: list[File | Space]):
+def solveTask2(diskMap: bytes):
     """
-    Solves the second task by iterating the files from right to left. For each file a suitable free space is found,
-    if such a space exists. The file is then moved to that space or left in place.
+    Solves the second task by iterating the files from right to left. For each file the left-most suitable
+    free space is taken from the space index, if such a space exists left of the file. The file is then
+    moved to that space or left in place.
     """
-    right = len(disk) - 1
-    moved: set[int] = set()
-    while right > 0:
-        toMove = disk[right]
-        if isinstance(toMove, File):
-            i = findFirstSpace(disk, toMove.size, right)
-            if i != None and not toMove.id in moved:
-                disk[i].size -= toMove.size
-                disk[right] = Space(toMove.size)
-                disk.insert(i, toMove)
-                moved.add(toMove.id)
-        right -= 1
-    print(calculateChecksum(disk))
-
+    files: list[tuple[int, int, int]] = []
+    spaces = SpaceIndex()
+    offset = 0
+    for i in range(len(diskMap)):
+        size = diskMap[i]
+        if i % 2 == 0:
+            files.append((i // 2, offset, size))
+        else:
+            spaces.add(offset, size)
+        offset += size
+    sum = 0
+    for id, offset, size in reversed(files):
+        space = spaces.takeFirst(size, offset)
+        if space != None:
+            offset = space
+        sum += getFileChecksum(id, offset, size)
+    print(sum)
 
-disk = readInput("input")
-solveTask2(disk)
+if __name__ == "__main__":
+    diskMap = readInput("input")
+    solveTask2(diskMap)
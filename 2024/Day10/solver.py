@@ -1,45 +1,38 @@
-class Pos:
-    def __init__(self, x, y):
-        """
-        Creates a new position with the given coordinates.
-        """
-        self.x = x
-        self.y = y
-    
-    def __eq__(self, value):
-        """
-        Checks if two positions are equal.
-        """
-        if not isinstance(value, Pos):
-            return False
-        return self.x == value.x and self.y == value.y
-    
-    def __hash__(self):
-        """
-        Calculates a hash of the instance.
-        """
-        return (self.x, self.y).__hash__()
-
 class Map:
     def __init__(self, lines: list[str]) -> None:
         """
-        Parses the input text into an object.
+        Parses the input text into an object. The heights are stored in a flat list at y * width + x,
+        cells without a height are stored as -1. Cells are also grouped by their height.
         """
         self.height = len(lines)
-        self.width = len(lines[0]) - 1
-        self._data = lines
-        self.heads: list[Pos] = []
-        for y in range(len(lines)):
-            for x in range(len(lines[y])):
-                if (lines[y][x] == "0"):
-                    self.heads.append(Pos(x, y))
+        self.width = len(lines[0].rstrip("\n"))
+        self._heights: list[int] = []
+        self.cellsByHeight: list[list[int]] = [[] for _ in range(10)]
+        for y in range(self.height):
+            for x in range(self.width):
+                char = lines[y][x]
+                value = int(char) if char.isdigit() else -1
+                if value >= 0:
+                    self.cellsByHeight[value].append(len(self._heights))
+                self._heights.append(value)
+        self.heads = self.cellsByHeight[0]
 
-    def get(self, pos: Pos) -> int:
-        if pos.x < 0 or pos.x >= self.width:
-            return -1
-        if pos.y < 0 or pos.y >= self.height:
-            return -1
-        return int(self._data[pos.y][pos.x])
+    def getUphillNeighbors(self, cell: int) -> list[int]:
+        """
+        Returns the neighboring cells that are exactly one higher than the given cell.
+        """
+        next = self._heights[cell] + 1
+        x = cell % self.width
+        neighbors = []
+        if x > 0 and self._heights[cell - 1] == next:
+            neighbors.append(cell - 1)
+        if x < self.width - 1 and self._heights[cell + 1] == next:
+            neighbors.append(cell + 1)
+        if cell >= self.width and self._heights[cell - self.width] == next:
+            neighbors.append(cell - self.width)
+        if cell + self.width < len(self._heights) and self._heights[cell + self.width] == next:
+            neighbors.append(cell + self.width)
+        return neighbors
 
 def readInput(filename: str):
     """
@@ -49,50 +42,35 @@ def readInput(filename: str):
     lines = data.readlines()
     return Map(lines)
 
-def getNeighborPositions(pos: Pos) -> list[Pos]:
-    """
-    Returns the four neighboring positions.
-    """
-    left = Pos(pos.x-1, pos.y)
-    right = Pos(pos.x+1, pos.y)
-    top = Pos(pos.x, pos.y-1)
-    bottom = Pos(pos.x, pos.y+1)
-    return [left, top, right, bottom]
-
-def followPath(start: Pos, map: Map, doRate = False):
+def followAllPaths(map: Map, doRate = False) -> int:
     """
-    Follows all paths starting at the given position and returns the number of peaks that can be reached.
-    If doRate is set, all distinct paths to the peak are counted.
+    Follows the paths of all trailheads at once by going through the cells from height 9 down to 0.
+    For every cell the peaks that can be reached are stored as a bitset and the sum of the trailhead scores
+    is returned. If doRate is set, the number of distinct paths to a peak is stored and summed up instead.
     """
-    ends = 0
-    queue = [start]
-    scheduled = set()
-    while len(queue) > 0:
-        currentPos = queue.pop(0)
-        current = map.get(currentPos)
-        if current == 9:
-            ends += 1
-            continue
-        neighbors = getNeighborPositions(currentPos)
-        for n in neighbors:
-            if map.get(n) == current + 1:
-                if not doRate and n in scheduled:
-                    continue
-                queue.append(n)
-                scheduled.add(n)
-    return ends
+    values = [0] * (map.width * map.height)
+    peaks = map.cellsByHeight[9]
+    for i in range(len(peaks)):
+        values[peaks[i]] = 1 if doRate else 1 << i
+    for height in range(8, -1, -1):
+        for cell in map.cellsByHeight[height]:
+            value = 0
+            for n in map.getUphillNeighbors(cell):
+                if doRate:
+                    value += values[n]
+                else:
+                    value |= values[n]
+            values[cell] = value
+    if doRate:
+        return sum(values[h] for h in map.heads)
+    return sum(values[h].bit_count() for h in map.heads)
 
 def solveTask1(map: Map):
-    sum = 0
-    for h in map.heads:
-        sum += followPath(h, map)
-    print(sum)
+    print(followAllPaths(map))
 
 def solveTask2(map: Map):
-    sum = 0
-    for h in map.heads:
-        sum += followPath(h, map, True)
-    print(sum)
+    print(followAllPaths(map, True))
 
-map = readInput("input")
-solveTask2(map)
\ No newline at end of file
+if __name__ == "__main__":
+    map = readInput("input")
+    solveTask2(map)
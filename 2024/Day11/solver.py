@@ -1,3 +1,7 @@
+from collections import OrderedDict
+import json
+import os
+
 def readInput(filename: str):
     """
     Parses the input file.
@@ -9,6 +13,16 @@ def readInput(filename: str):
     strings = lines[0].strip().split(" ")
     return list(map(int, strings))
 
+def countDigits(n: int) -> int:
+    """
+    Returns the number of decimal digits of the given number.
+    """
+    digits = 1
+    while n >= 10:
+        n //= 10
+        digits += 1
+    return digits
+
 def getStonesAfterBlink(stone: int):
     """
     Returns a list of stones that appear from the given stone after one blink.
@@ -16,11 +30,12 @@ def getStonesAfterBlink(stone: int):
     next: list[int] = []
     if stone == 0:
         next.append(1)
-    elif len(str(stone)) % 2 == 0:
-        string = str(stone)
-        half = int(len(string)/2)
-        next.append(int(string[:half]))
-        next.append(int(string[half:]))
+        return next
+    digits = countDigits(stone)
+    if digits % 2 == 0:
+        left, right = divmod(stone, 10 ** (digits // 2))
+        next.append(left)
+        next.append(right)
     else:
         next.append(stone * 2024)
     return next
@@ -74,5 +89,158 @@ def solveTask2(stones: list[int]):
         newOccs = {}
     print(sumValues(occs))
 
-stones = readInput("input")
-solveTask2(stones)
\ No newline at end of file
+class StoneCounter:
+    def __init__(self, maxSize = 1 << 20, cacheFile: str | None = None) -> None:
+        """
+        Creates a new counter with an LRU cache holding at most maxSize results of (stone, blinks).
+        If a cache file is given and exists, the results stored in it are loaded.
+        """
+        self.maxSize = maxSize
+        self.cacheFile = cacheFile
+        self._cache: OrderedDict[tuple[int, int], int] = OrderedDict()
+        if cacheFile != None and os.path.exists(cacheFile):
+            with open(cacheFile, "r") as f:
+                for stone, blinks, count in json.load(f):
+                    self._put((stone, blinks), count)
+
+    def _get(self, key: tuple[int, int]) -> int | None:
+        """
+        Returns the cached result and marks it as recently used.
+        """
+        count = self._cache.get(key)
+        if count != None:
+            self._cache.move_to_end(key)
+        return count
+
+    def _put(self, key: tuple[int, int], count: int):
+        """
+        Caches the result, dropping the least recently used one if the cache is full.
+        """
+        self._cache[key] = count
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.maxSize:
+            self._cache.popitem(last=False)
+
+    def count(self, stone: int, blinks: int) -> int:
+        """
+        Returns the number of stones the given stone turns into after the given number of blinks.
+        The recursion is unrolled into an explicit stack, so any number of blinks works. Partial sums
+        are kept on the stack, so results evicted from the cache are never needed again.
+        """
+        if blinks == 0:
+            return 1
+        cached = self._get((stone, blinks))
+        if cached != None:
+            return cached
+        # every frame holds the stone, its blinks, the children still to count and the sum so far
+        stack: list[list] = [[stone, blinks, getStonesAfterBlink(stone), 0]]
+        result = 0
+        while len(stack) > 0:
+            frame = stack[-1]
+            children = frame[2]
+            if len(children) == 0:
+                stack.pop()
+                result = frame[3]
+                self._put((frame[0], frame[1]), result)
+                if len(stack) > 0:
+                    stack[-1][3] += result
+                continue
+            child = children.pop()
+            childBlinks = frame[1] - 1
+            if childBlinks == 0:
+                frame[3] += 1
+                continue
+            cached = self._get((child, childBlinks))
+            if cached != None:
+                frame[3] += cached
+                continue
+            stack.append([child, childBlinks, getStonesAfterBlink(child), 0])
+        return result
+
+    def save(self):
+        """
+        Writes the cached results to the cache file, if there is one.
+        """
+        if self.cacheFile == None:
+            return
+        with open(self.cacheFile, "w") as f:
+            json.dump([[stone, blinks, count] for (stone, blinks), count in self._cache.items()], f)
+
+def countStones(stones: list[int], blinks: int, counter: StoneCounter | None = None) -> int:
+    """
+    Counts all stones after the given number of blinks using the given counter.
+    """
+    if counter == None:
+        counter = StoneCounter()
+    return sum(counter.count(s, blinks) for s in stones)
+
+def solveTask1Memoized(stones: list[int], cacheFile: str | None = None):
+    """
+    Solves the first task by counting the stones with a memoized counter.
+    """
+    counter = StoneCounter(cacheFile=cacheFile)
+    print(countStones(stones, 25, counter))
+    counter.save()
+
+def solveTask2Memoized(stones: list[int], cacheFile: str | None = None):
+    """
+    Solves the second task by counting the stones with a memoized counter.
+    """
+    counter = StoneCounter(cacheFile=cacheFile)
+    print(countStones(stones, 75, counter))
+    counter.save()
+
+def getTransitions(stones: list[int]) -> tuple[list[int], list[list[int]]]:
+    """
+    Finds the closed set of engravings that can appear from the given stones. Returns the engravings and,
+    for each of them, the indices of the engravings it turns into after one blink.
+    """
+    values: list[int] = []
+    indices: dict[int, int] = {}
+    for s in stones:
+        if not s in indices:
+            indices[s] = len(values)
+            values.append(s)
+    transitions: list[list[int]] = []
+    i = 0
+    while i < len(values):
+        next: list[int] = []
+        for v in getStonesAfterBlink(values[i]):
+            if not v in indices:
+                indices[v] = len(values)
+                values.append(v)
+            next.append(indices[v])
+        transitions.append(next)
+        i += 1
+    return (values, transitions)
+
+def countStonesByTransitions(stones: list[int], blinks: int) -> int:
+    """
+    Counts all stones after the given number of blinks. The transitions between the engravings of the closed
+    set are built once, so every blink only adds up the counts along the precomputed edges.
+    """
+    values, transitions = getTransitions(stones)
+    indices = {values[i]: i for i in range(len(values))}
+    counts = [0] * len(values)
+    for s in stones:
+        counts[indices[s]] += 1
+    for _ in range(blinks):
+        next = [0] * len(values)
+        for i in range(len(counts)):
+            amount = counts[i]
+            if amount == 0:
+                continue
+            for j in transitions[i]:
+                next[j] += amount
+        counts = next
+    return sum(counts)
+
+def solveTask2ByTransitions(stones: list[int]):
+    """
+    Solves the second task by blinking along the precomputed transitions.
+    """
+    print(countStonesByTransitions(stones, 75))
+
+if __name__ == "__main__":
+    stones = readInput("input")
+    solveTask2(stones)
@@ -1,108 +1,59 @@
-class Pos:
-    def __init__(self, x, y) -> None:
-        """
-        Creates a new position at the given coordinates.
-        """
-        self.x = x
-        self.y = y
-
-    def getNeighbors(self):
-        """
-        Returns all four neighboring positions.
-        """
-        return [
-            Pos(self.x+1, self.y),
-            Pos(self.x-1, self.y),
-            Pos(self.x, self.y+1),
-            Pos(self.x, self.y-1),
-        ]
-    
-    def __repr__(self) -> str:
-        """
-        Returns a human readable representation.
-        """
-        return f"Pos({self.x}, {self.y})"
-    
-    def __hash__(self) -> int:
-        """
-        Returns the hash.
-        """
-        return (self.x, self.y).__hash__()
-    
-    def __eq__(self, value: object) -> bool:
-        if not isinstance(value, Pos):
-            return False
-        return self.x == value.x and self.y == value.y
-    
-class BorderSegment:
-    def __init__(self, p1: Pos, p2: Pos) -> None:
-        """
-        Creates a new border segment between two positions.
-        The first position must be inside, the second outside.
-        """
-        if p1.x == p2.x and p1.y - p2.y == 1:
-            self.startPos = p1
-            self.endPos = Pos(p1.x + 1, p1.y)
-            self.direction = "R"
-        elif p1.x == p2.x and p1.y - p2.y == -1:
-            self.startPos = Pos(p1.x + 1, p1.y + 1)
-            self.endPos = Pos(p1.x, p1.y + 1)
-            self.direction = "L"
-        elif p1.y == p2.y and p1.x - p2.x == 1:
-            self.startPos = Pos(p1.x, p1.y + 1)
-            self.endPos = Pos(p1.x, p1.y)
-            self.direction = "U"
-        elif p1.y == p2.y and p1.x - p2.x == -1:
-            self.startPos = p2
-            self.endPos = Pos(p2.x, p2.y + 1)
-            self.direction = "D"
-        else:
-            raise ValueError("BorderSegment can only be created between adjacent positions.")
-
 class Map:
     def __init__(self, data: list[str]) -> None:
         """
-        Creates a new map from the input data.
+        Creates a new map from the input data. The plants are stored in a flat string at y * width + x.
         """
-        self._data = data
         self.height = len(data)
-        self.width = len(data[0]) - 1
-        self.visited = []
-        for _ in range(self.height):
-            row = []
-            for _ in range(self.width):
-                row.append(False)
-            self.visited.append(row)
+        self.width = len(data[0].rstrip("\n"))
+        self.plants = "".join(l.rstrip("\n") for l in data)
+        if len(self.plants) != self.width * self.height:
+            raise ValueError("All lines of the map must have the same length.")
 
-    def get(self, pos: Pos):
+class RegionLabels:
+    def __init__(self, size: int) -> None:
         """
-        Returns the value at the given position.
+        Creates a union-find structure over the given number of cells. Every root holds the area, the border
+        length and the number of corners of its region.
         """
-        if pos.x < 0 or pos.x >= self.width:
-            return ""
-        if pos.y < 0 or pos.y >= self.height:
-            return ""
-        return self._data[pos.y][pos.x]
+        self._parents = list(range(size))
+        self.areas = [0] * size
+        self.borders = [0] * size
+        self.corners = [0] * size
 
-    def wasVisited(self, pos: Pos):
+    def find(self, cell: int) -> int:
         """
-        Returns true if the given position was already visited.
+        Returns the root of the region of the given cell.
         """
-        if pos.x < 0 or pos.x >= self.width:
-            return True
-        if pos.y < 0 or pos.y >= self.height:
-            return True
-        return self.visited[pos.y][pos.x]
-    
-    def markVisited(self, pos: Pos):
+        parents = self._parents
+        while parents[cell] != cell:
+            parents[cell] = parents[parents[cell]]
+            cell = parents[cell]
+        return cell
+
+    def union(self, a: int, b: int):
         """
-        Marks the given position as visited.
+        Merges the regions of the given cells, adding up their values in the root of the larger region.
         """
-        if pos.x < 0 or pos.x >= self.width:
-            return
-        if pos.y < 0 or pos.y >= self.height:
+        rootA = self.find(a)
+        rootB = self.find(b)
+        if rootA == rootB:
             return
-        self.visited[pos.y][pos.x] = True
+        if self.areas[rootA] < self.areas[rootB]:
+            rootA, rootB = rootB, rootA
+        self._parents[rootB] = rootA
+        self.areas[rootA] += self.areas[rootB]
+        self.borders[rootA] += self.borders[rootB]
+        self.corners[rootA] += self.corners[rootB]
+
+    def getRegions(self) -> list[tuple[int, int, int]]:
+        """
+        Returns area, border length and number of corners for every region.
+        """
+        regions = []
+        for cell in range(len(self._parents)):
+            if self._parents[cell] == cell:
+                regions.append((self.areas[cell], self.borders[cell], self.corners[cell]))
+        return regions
 
 def readInput(filename: str):
     """
@@ -112,98 +63,67 @@ def readInput(filename: str):
     lines = data.readlines()    
     return Map(lines)
 
-def analyzeArea(map: Map, start: Pos):
-    """
-    Finds the size of a planting area and all border segments using BFS.
-    """
-    value = map.get(start)
-    map.markVisited(start)
-    queue = [start]
-    area = 0
-    border = 0
-    segments: dict[Pos, list[BorderSegment]] = {}
-    while len(queue) > 0:
-        current = queue.pop(0)
-        area += 1
-        neighbors = current.getNeighbors()
-        for n in neighbors:
-            if map.get(n) != value:
-                border += 1
-                segment = BorderSegment(current, n)
-                if (not segment.startPos in segments):
-                    segments[segment.startPos] = []
-                segments[segment.startPos].append(segment)
-                continue
-            if map.wasVisited(n):
-                continue
-            map.markVisited(n)
-            queue.append(n)
-    return (area, border, segments)
-
-def getAnyBorderSegment(segments: dict[Pos, list[BorderSegment]]):
-    """
-    Returns any border segment from the given segment collection.
-    """
-    key, current = segments.popitem()
-    if len(current) == 1:
-        return current[0]
-    element = current.pop()
-    segments[key] = current
-    return element
-
-def countSides(segments: dict[Pos, list[BorderSegment]]):
+def analyzeRegions(map: Map) -> list[tuple[int, int, int]]:
     """
-    Reconstructs the border and counts the number of sides.
+    Labels all planting areas in a single pass over the rows. Each cell is merged with its left and upper
+    neighbor if they have the same plant. The border length and the corners of a region are counted per cell
+    from its eight neighbors, a region has as many sides as corners.
+    Returns area, border length and number of sides for every region.
     """
-    sum = 0
-    while len(segments) > 0:
-        current = getAnyBorderSegment(segments)
-        direction = current.direction
-        start = current.startPos
-        startDir = direction
-        changes = 0
-        while True:
-            nextList = segments[current.endPos]
-            next = nextList.pop()
-            if len(nextList) == 0:
-                del segments[current.endPos]
-            if next.direction != direction:
-                changes += 1
-            if next.endPos == start:
-                if next.direction != startDir:
-                    changes += 1
-                sum += changes
-                break
-            direction = next.direction
-            current = next
-    return sum
+    width = map.width
+    height = map.height
+    plants = map.plants
+    labels = RegionLabels(width * height)
+    for y in range(height):
+        for x in range(width):
+            cell = y * width + x
+            plant = plants[cell]
+            hasUp = y > 0
+            hasDown = y < height - 1
+            hasLeft = x > 0
+            hasRight = x < width - 1
+            up = hasUp and plants[cell - width] == plant
+            down = hasDown and plants[cell + width] == plant
+            left = hasLeft and plants[cell - 1] == plant
+            right = hasRight and plants[cell + 1] == plant
+            upLeft = hasUp and hasLeft and plants[cell - width - 1] == plant
+            upRight = hasUp and hasRight and plants[cell - width + 1] == plant
+            downLeft = hasDown and hasLeft and plants[cell + width - 1] == plant
+            downRight = hasDown and hasRight and plants[cell + width + 1] == plant
+            # an outer corner has no neighbors on both sides, an inner corner lacks only the diagonal one
+            corners = 0
+            corners += (not up and not left) or (up and left and not upLeft)
+            corners += (not up and not right) or (up and right and not upRight)
+            corners += (not down and not left) or (down and left and not downLeft)
+            corners += (not down and not right) or (down and right and not downRight)
+            labels.areas[cell] = 1
+            labels.borders[cell] = 4 - up - down - left - right
+            labels.corners[cell] = corners
+            if left:
+                labels.union(cell, cell - 1)
+            if up:
+                labels.union(cell, cell - width)
+    return labels.getRegions()
 
 def solveTask1(map: Map):
     """
     Solves the first task by analyzing all planting areas.
     """
     sum = 0
-    for y in range(map.height):
-        for x in range(map.width):
-            if not map.wasVisited(Pos(x, y)):
-                area, border, _ = analyzeArea(map, Pos(x, y))
-                sum += area * border
+    for area, border, _ in analyzeRegions(map):
+        sum += area * border
     print(sum)
 
 def solveTask2(map: Map):
     """
-    Solves the second task by analyzing all planting areas, constructing the border and counting the
-    consecutive border segments (number of sides).
+    Solves the second task by analyzing all planting areas and using the number of corners as the number of sides.
     """
     sum = 0
-    for y in range(map.height):
-        for x in range(map.width):
-            if not map.wasVisited(Pos(x, y)):
-                area, _, segments = analyzeArea(map, Pos(x, y))
-                sides = countSides(segments)
-                sum += area * sides
+    for area, _, sides in analyzeRegions(map):
+        sum += area * sides
     print(sum)
 
 
-map = readInput("input")
-solveTask2(map)
\ No newline at end of file
+if __name__ == "__main__":
+    map = readInput("input")
+    solveTask2(map)
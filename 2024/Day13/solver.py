@@ -1,3 +1,5 @@
+import numpy as np
+
 class  Vec:
     def __init__(self, x: int, y: int) -> None:
         """
@@ -11,36 +13,6 @@ class  Vec:
         Returns a human readable representation.
         """
         return f"({self.x}, {self.y})"
-    
-    def __sub__(self, other):
-        """
-        Calculates the difference.
-        """
-        if not isinstance(other, Vec):
-            raise TypeError("Vec can only be subtracted by Vec.")
-        return Vec(self.x - other.x, self.y - other.y)
-    
-    def scale(self, s: int):
-        """
-        Returnes a new Vec representing a scaled Vec.
-        """
-        return Vec(self.x * s, self.y * s)
-    
-    def isDivisibleBy(self, other):
-        """
-        Checks if the other Vec can be scaled by an int to match the current Vec.
-        """
-        return self.x % other.x == 0 and self.y % other.y == 0
-    
-    def findScale(self, other):
-        """
-        Finds an integer scale to make other the same as self if it exists.
-        """
-        fX = self.x / other.x
-        fY = self.y / other.y
-        if not fX.is_integer() or not fY.is_integer() or fX != fY:
-            return None
-        return int(fX)
 
 
 class ClawMachine:
@@ -57,26 +29,104 @@ class ClawMachine:
         split = lines[2].strip()[6:].split(",")
         self.price = Vec(int(split[0][3:]), int(split[1][3:]))
 
-def findStrategy(m: ClawMachine):
-    """
-    Finds a suitable strategy.
-    First, ButtonA and ButtonB (or their direction) are treated as lines of the form y = ax + b.
-    The line representing ButtonA has a b value of 0 because the claw machine starts at (0, 0).
-    The b value of the line representing ButtonB can be calculated using b = y - m_b * x
-    Then, the intersection point of the two lines can be calculated.
-    The ratio intersection.x / buttonA.x is roughly the amount of ButtonA presses that are needed.
-    """
-    gradA = m.buttonA.y / m.buttonA.x
-    gradB = m.buttonB.y / m.buttonB.x
-    b = m.price.y - gradB * m.price.x
-    x = b/(gradA - gradB)
-    roughAmountA = int(x / m.buttonA.x)
-    for i in range(roughAmountA-1, roughAmountA+2):
-        remaining = m.price - m.buttonA.scale(i)
-        if remaining.isDivisibleBy(m.buttonB):
-            scale = remaining.findScale(m.buttonB)
-            if scale != None:
-                return (i, scale)
+def extendedGcd(a: int, b: int) -> tuple[int, int, int]:
+    """
+    Returns (g, x, y) with g = gcd(a, b) and a * x + b * y = g.
+    """
+    if b == 0:
+        return (a, 1, 0)
+    g, x, y = extendedGcd(b, a % b)
+    return (g, y, x - (a // b) * y)
+
+def findCollinearStrategy(a: int, b: int, target: int) -> tuple[int, int] | None:
+    """
+    Finds the cheapest strategy if both buttons move the claw along the same line as the price.
+    The positions are projected onto the line, so i * a + j * b = target has to be solved for non-negative i and j.
+    All solutions are i0 + k * b / g and j0 - k * a / g and the cost changes linearly with k, so the cheapest
+    solution is at one end of the valid range of k.
+    """
+    if a == 0 and b == 0:
+        return (0, 0) if target == 0 else None
+    if b == 0:
+        return (target // a, 0) if target % a == 0 and target >= 0 else None
+    if a == 0:
+        return (0, target // b) if target % b == 0 and target >= 0 else None
+    g, x, y = extendedGcd(a, b)
+    if target % g != 0:
+        return None
+    i0 = x * (target // g)
+    j0 = y * (target // g)
+    stepA = b // g
+    stepB = a // g
+    kMin = -(i0 // stepA)
+    kMax = j0 // stepB
+    if kMin > kMax:
+        return None
+    k = kMax if 3 * stepA < stepB else kMin
+    return (i0 + k * stepA, j0 - k * stepB)
+
+def findStrategy(m: ClawMachine, offset = 0) -> tuple[int, int] | None:
+    """
+    Finds a suitable strategy by solving the linear system a * buttonA + b * buttonB = price with Cramer's rule.
+    Only integer arithmetic is used, so the strategy is exact for any price. If the buttons are collinear,
+    the cheapest of all solutions is searched along the line. The price can be moved by the given offset.
+    """
+    a, b = m.buttonA, m.buttonB
+    p = Vec(m.price.x + offset, m.price.y + offset)
+    det = a.x * b.y - a.y * b.x
+    if det == 0:
+        if a.x * p.y != a.y * p.x or b.x * p.y != b.y * p.x:
+            return None
+        if a.x == 0 and a.y == 0 and b.x == 0 and b.y == 0:
+            return (0, 0) if p.x == 0 and p.y == 0 else None
+        if a.x != 0 or b.x != 0:
+            return findCollinearStrategy(a.x, b.x, p.x)
+        return findCollinearStrategy(a.y, b.y, p.y)
+    numA = p.x * b.y - p.y * b.x
+    numB = a.x * p.y - a.y * p.x
+    if numA % det != 0 or numB % det != 0:
+        return None
+    pressesA = numA // det
+    pressesB = numB // det
+    if pressesA < 0 or pressesB < 0:
+        return None
+    return (pressesA, pressesB)
+
+def countTokensVectorized(machines: list[ClawMachine], offset = 0) -> int:
+    """
+    Solves all claw machines at once with Cramer's rule on arrays and returns the tokens needed for all prices.
+    The price of every machine is moved by the given offset. Machines with collinear buttons are solved one by one.
+    Arrays of Python ints are only used if the products could overflow 64 bit integers.
+    """
+    if len(machines) == 0:
+        return 0
+    values = [[m.buttonA.x, m.buttonA.y, m.buttonB.x, m.buttonB.y, m.price.x + offset, m.price.y + offset] for m in machines]
+    try:
+        table = np.array(values, dtype=np.int64)
+        largestButton = int(np.abs(table[:, :4]).max())
+        largestPrice = int(np.abs(table[:, 4:]).max())
+        # a price is only ever multiplied by a button value, and the presses are at most the numerators,
+        # so 3 * pressesA + pressesB is bounded by 4 * 2 * button * max(price, button)
+        if 8 * largestButton * max(largestPrice, largestButton) >= 2 ** 63:
+            table = table.astype(object)
+    except OverflowError:
+        table = np.array(values, dtype=object)
+    aX, aY, bX, bY, pX, pY = table.T
+    det = aX * bY - aY * bX
+    numA = pX * bY - pY * bX
+    numB = aX * pY - aY * pX
+    collinear = det == 0
+    divisor = np.where(collinear, 1, det)
+    pressesA = numA // divisor
+    pressesB = numB // divisor
+    valid = ~collinear & (numA % divisor == 0) & (numB % divisor == 0) & (pressesA >= 0) & (pressesB >= 0)
+    # summed as Python ints, the total of many machines could still exceed 64 bit
+    tokens = sum(np.where(valid, pressesA * 3 + pressesB, 0).tolist())
+    for i in np.flatnonzero(collinear):
+        strat = findStrategy(machines[i], offset)
+        if strat != None:
+            tokens += strat[0] * 3 + strat[1]
+    return tokens
 
 def readInput(filename: str):
     """
@@ -107,12 +157,23 @@ def solveTask2(machines: list[ClawMachine]):
     """
     tokens = 0
     for m in machines:
-        m.price.x += 10000000000000
-        m.price.y += 10000000000000
-        strat = findStrategy(m)
+        strat = findStrategy(m, 10000000000000)
         if strat != None:
             tokens += strat[0] * 3 + strat[1]
     print(tokens)
-    
-machines = readInput("input")
-solveTask2(machines)
\ No newline at end of file
+
+def solveTask1Vectorized(machines: list[ClawMachine]):
+    """
+    Solves task 1 for all machines at once.
+    """
+    print(countTokensVectorized(machines))
+
+def solveTask2Vectorized(machines: list[ClawMachine]):
+    """
+    Solves task 2 for all machines at once with the moved price positions.
+    """
+    print(countTokensVectorized(machines, 10000000000000))
+
+if __name__ == "__main__":
+    machines = readInput("input")
+    solveTask2(machines)
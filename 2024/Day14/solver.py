@@ -1,4 +1,6 @@
-import time
+import math
+
+import numpy as np
 
 class Pos:
     def __init__(self, x: int, y: int) -> None:
@@ -68,55 +70,119 @@ def solveTask1(robots: list[Robot], width: int, height: int):
         endPositions.append(endPos)
     print(getSafetyFactor(endPositions, width, height))
 
-def countRobotsInAreas(positions: list[Pos], width: int, size: int):
+def findAlignment(positions: list[int], velocities: list[int], size: int) -> int:
     """
-    Splits the map into squares of given size and counts the number of robots in each square.
+    Returns the time within one period of an axis at which the robots are spread the least along that axis.
+    The spread is the variance of the positions, calculated as n * sum(p^2) - sum(p)^2 to stay with integers.
     """
-    nAreas = (width // size) + 1
-    areas = []
-    for _ in range(nAreas):
-        areas.append([0] * nAreas)
-    for p in positions:
-        yArea = p.y // size
-        xArea = p.x // size
-        areas[yArea][xArea] += 1
-    return areas
+    n = len(positions)
+    bestTime = 0
+    bestSpread = None
+    for t in range(size):
+        sum = 0
+        squares = 0
+        for i in range(n):
+            p = (positions[i] + t * velocities[i]) % size
+            sum += p
+            squares += p * p
+        spread = n * squares - sum * sum
+        if bestSpread == None or spread < bestSpread:
+            bestSpread = spread
+            bestTime = t
+    return bestTime
 
-def printRobotPositions(robots: list[Pos], width: int, height: int):
+def solveTask2(robots: list[Robot], width: int, height: int):
     """
-    Prints an ASCII-image of the robots positions.
+    Solves the second task. To draw a christmas tree the robots have to be close together on both axes.
+    The x positions repeat every width seconds and the y positions every height seconds, so the times with the
+    least spread on each axis are searched separately. The chinese remainder theorem then gives the time
+    within the whole period at which both axes are aligned. The width and height have to be coprime.
     """
-    image = []
-    for _ in range(height):
-        image.append([" "] * width)
-    for r in robots:
-        image[r.y % height][r.x % width] = "#"
-    for r in image:
-        print("".join(r))
-    print("", flush=True)
-
-def solveTask2(robots: list[Robot], width: int, height: int, fromIt = 5000, toIt = 7000):
-    """
-    Solves the second task by simulating the robots and keeping track of the number of robots in the
-    square with the highest density. To draw a christmas tree a few squares will have a very high robot
-    density. For visual confirmation the frames are drawn to terminal.
-    """
-    maxDensity = 0
-    for i in range(fromIt, toIt + 1):
-        endPositions = []
-        for r in robots:
-            x = r.position.x + i * r.velocity.x
-            y = r.position.y + i * r.velocity.y
-            endPos = Pos(x % width, y % height)
-            endPositions.append(endPos)
-        areas = countRobotsInAreas(endPositions, width, 10)
-        for r in areas:
-            for v in r:
-                if v > maxDensity:
-                    maxDensity = v
-                if v > 50:
-                    print("found valid option", i)
-                    printRobotPositions(endPositions, width, height)
-
-robots = readInput("input")
-solveTask2(robots, 101, 103)
\ No newline at end of file
+    timeX = findAlignment([r.position.x for r in robots], [r.velocity.x for r in robots], width)
+    timeY = findAlignment([r.position.y for r in robots], [r.velocity.y for r in robots], height)
+    # t = timeX + width * k with t = timeY (mod height)
+    k = (timeY - timeX) * pow(width, -1, height) % height
+    print(timeX + width * k)
+
+NUMBER_SEPARATORS = str.maketrans("pv=,", "    ")
+
+def readInputVectorized(filename: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Parses the input file straight into integer arrays. Returns the positions and velocities with one row
+    per robot and the columns x and y.
+    """
+    data = open("2024/Day14/" + filename + ".txt", "r")
+    text = data.read().translate(NUMBER_SEPARATORS)
+    values = np.fromstring(text, dtype=np.int64, sep=" ").reshape(-1, 4)
+    return (values[:, 0:2], values[:, 2:4])
+
+def step(positions: np.ndarray, velocities: np.ndarray, t: int | np.ndarray, width: int, height: int) -> np.ndarray:
+    """
+    Returns the positions of all robots after t seconds. If t is an array of times, an array of positions
+    with one entry per time is returned.
+    """
+    times = np.asarray(t, dtype=np.int64)[..., np.newaxis, np.newaxis]
+    return (positions + times * velocities) % np.array([width, height])
+
+def getSafetyFactorVectorized(positions: np.ndarray, width: int, height: int) -> int | list[int]:
+    """
+    Returns the safety factor of the given positions. Every robot gets the id of its quadrant and the robots
+    per quadrant are counted with bincount. For an array of positions per time one factor per time is returned.
+    """
+    x = positions[..., 0]
+    y = positions[..., 1]
+    inQuadrant = (x != width // 2) & (y != height // 2)
+    quadrants = (x > width // 2) + 2 * (y > height // 2)
+    # the frame count is given explicitly, an empty swarm can not be reshaped otherwise
+    frameCount = 1 if positions.ndim == 2 else positions.shape[0]
+    frames = quadrants.reshape(frameCount, -1)
+    frameIds = np.arange(len(frames))[:, np.newaxis]
+    ids = (4 * frameIds + frames)[inQuadrant.reshape(frames.shape)]
+    counts = np.bincount(ids, minlength=4 * len(frames)).reshape(-1, 4)
+    # the product can exceed 64 bit for many robots
+    factors = [math.prod(int(c) for c in row) for row in counts]
+    if positions.ndim == 2:
+        return factors[0]
+    return factors
+
+def solveTask1Vectorized(positions: np.ndarray, velocities: np.ndarray, width: int, height: int):
+    """
+    Solves the first task by calculating the positions of all robots at once.
+    """
+    endPositions = step(positions, velocities, 100, width, height)
+    print(getSafetyFactorVectorized(endPositions, width, height))
+
+def findAlignmentVectorized(positions: np.ndarray, velocities: np.ndarray, size: int) -> int:
+    """
+    Returns the time within one period of an axis at which the robots are spread the least along that axis.
+    The times are stepped through one by one while all robots are moved at once, so the memory only grows
+    with the number of robots.
+    """
+    n = len(positions)
+    frame = positions % size
+    moves = velocities % size
+    bestTime = 0
+    bestSpread = None
+    for t in range(size):
+        # n * n times the variance, kept as python ints so that large swarms can not overflow
+        total = int(frame.sum())
+        spread = n * int(np.dot(frame, frame)) - total * total
+        if bestSpread == None or spread < bestSpread:
+            bestTime = t
+            bestSpread = spread
+        frame += moves
+        frame %= size
+    return bestTime
+
+def solveTask2Vectorized(positions: np.ndarray, velocities: np.ndarray, width: int, height: int):
+    """
+    Solves the second task like solveTask2, but evaluates every axis for a whole period at once.
+    """
+    timeX = findAlignmentVectorized(positions[:, 0], velocities[:, 0], width)
+    timeY = findAlignmentVectorized(positions[:, 1], velocities[:, 1], height)
+    k = (timeY - timeX) * pow(width, -1, height) % height
+    print(timeX + width * k)
+
+if __name__ == "__main__":
+    robots = readInput("input")
+    solveTask2(robots, 101, 103)
@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Iterable, Iterator
 
 class Tile(Enum):
     FREE = "."
@@ -10,199 +11,177 @@ class Tile(Enum):
     def __repr__(self) -> str:
         return self.value
 
+# the tiles as they are stored in the map's bytearray
+FREE = ord(Tile.FREE.value)
+WALL = ord(Tile.WALL.value)
+CHEST_FULL = ord(Tile.CHEST_FULL.value)
+CHEST_LEFT = ord(Tile.CHEST_LEFT.value)
+CHEST_RIGHT = ord(Tile.CHEST_RIGHT.value)
+
 class Command(Enum):
     UP = 0
     DOWN = 1
     LEFT = 2
     RIGHT = 3
 
-class Pos:
-    def __init__(self, x: int, y: int) -> None:
-        """
-        Creates a new position.
-        """
-        self.x = x
-        self.y = y
-
-    def neighbor(self, command: Command):
-        """
-        Returns the neighbor in the given direction.
-        """
-        if command == Command.UP:
-            return Pos(self.x, self.y - 1)
-        if command == Command.DOWN:
-            return Pos(self.x, self.y + 1)
-        if command == Command.LEFT:
-            return Pos(self.x - 1, self.y)
-        if command == Command.RIGHT:
-            return Pos(self.x + 1, self.y)
-        raise ValueError("Unexpected command")
-    
-    def __repr__(self) -> str:
-        """
-        Returns a human readable representation.
-        """
-        return f"({self.x}, {self.y})"
-
 class Map:
     def __init__(self, strings: list[str]) -> None:
         """
-        Creates a new map by parsing the strings.
+        Creates a new map by parsing the strings. The tiles are stored as their characters in a flat bytearray
+        at y * width + x, the robot is stored as such an index as well.
         """
         self.height = len(strings)
         self.width = len(strings[0]) - 1
-        data: list[list[Tile]] = []
+        grid = bytearray()
         for y in range(len(strings)):
-            row: list[Tile] = []
-            for x in range(len(strings[y])):
-                c = strings[y][x]
-                if c == ".":
-                    row.append(Tile.FREE)
-                if c == "#":
-                    row.append(Tile.WALL)
-                if c == "O":
-                    row.append(Tile.CHEST_FULL)
-                if c == "@":
-                    self.robot = Pos(x, y)   
-                    row.append(Tile.FREE)
-            data.append(row)
-        self._data = data
+            row = strings[y].rstrip("\n")
+            x = row.find("@")
+            if x >= 0:
+                self.robot = y * self.width + x
+            grid.extend(row.replace("@", Tile.FREE.value).encode())
+        self._grid = grid
+        self._updateSteps()
+        self._gpsSum = self._calculateChestGpsSum()
+
+    def _updateSteps(self):
+        """
+        Updates the index offsets of the commands, which depend on the width.
+        """
+        self._steps = {
+            Command.UP: -self.width,
+            Command.DOWN: self.width,
+            Command.LEFT: -1,
+            Command.RIGHT: 1,
+        }
 
     def convertToWideVersion(self):
         """
         Converts the map into the wide version of task 2.
         """
-        data: list[list[Tile]] = []
-        for y in range(self.height):
-            row: list[Tile] = []
-            for x in range(self.width):
-                t = self._data[y][x]
-                if t == Tile.WALL:
-                    row.extend([Tile.WALL, Tile.WALL])
-                if t == Tile.CHEST_FULL:
-                    row.extend([Tile.CHEST_LEFT, Tile.CHEST_RIGHT])
-                if t == Tile.FREE:
-                    row.extend([Tile.FREE, Tile.FREE])
-            data.append(row)
-        self._data = data
+        wide = {
+            ord(Tile.WALL.value): (Tile.WALL.value * 2).encode(),
+            ord(Tile.CHEST_FULL.value): (Tile.CHEST_LEFT.value + Tile.CHEST_RIGHT.value).encode(),
+            ord(Tile.FREE.value): (Tile.FREE.value * 2).encode(),
+        }
+        self._grid = bytearray(b"".join(wide[t] for t in self._grid))
+        y, x = divmod(self.robot, self.width)
         self.width *= 2
-        self.robot.x *= 2
-
-    def getTile(self, pos: Pos):
-        """
-        Returns the tile at the given position.
-        """
-        return self._data[pos.y][pos.x]
-    
-    def setTile(self, pos: Pos, tile: Tile):
-        """
-        Sets the given tile to the given position.
-        """
-        self._data[pos.y][pos.x] = tile
-
-    def _getPositionOfOtherHalfChest(self, pos: Pos):
-        """
-        Returns the position of the other half of the chest at the given position.
-        """
-        tile = self.getTile(pos)
-        if tile == Tile.CHEST_RIGHT:
-            return pos.neighbor(Command.LEFT)
-        if tile == Tile.CHEST_LEFT:
-            return pos.neighbor(Command.RIGHT)
-        raise ValueError(f"Half chest expected at given position, found {tile}.")
-    
-    def _checkMoveTo(self, pos: Pos, direction: Command):
-        """
-        Checks if the given move can be performed, i.e. if there is an empty tile in the desired direction.
-        """
-        n = pos.neighbor(direction)
-        tile = self.getTile(pos)
-        if tile == Tile.CHEST_FULL:
-            return self._checkMoveTo(n, direction)
-        if tile == Tile.CHEST_LEFT or tile == Tile.CHEST_RIGHT:
-            if direction == Command.LEFT or direction == Command.RIGHT:
-                return self._checkMoveTo(n, direction)
-            if direction == Command.UP or direction == Command.DOWN:
-                otherHalfN = self._getPositionOfOtherHalfChest(pos).neighbor(direction)
-                return self._checkMoveTo(n, direction) and self._checkMoveTo(otherHalfN, direction)
-        return tile == Tile.FREE
-
-    def _performMoveTo(self, pos: Pos, direction: Command):
-        """
-        Tries to perform the given move. Returns True if the move was completed successfully.
-        """
-        n = pos.neighbor(direction)
-        tile = self.getTile(pos)
-        if tile == Tile.CHEST_FULL:
-            self._performMoveTo(n, direction)
-            self.setTile(pos, Tile.FREE)
-            self.setTile(n, tile)
-        if tile == Tile.CHEST_LEFT or tile == Tile.CHEST_RIGHT:
-            if direction == Command.LEFT or direction == Command.RIGHT:
-                self._performMoveTo(n, direction)
-                self.setTile(pos, Tile.FREE)
-                self.setTile(n, tile)
-            if direction == Command.UP or direction == Command.DOWN:
-                otherHalf = self._getPositionOfOtherHalfChest(pos)
-                otherTile = Tile.CHEST_LEFT
-                if tile == Tile.CHEST_LEFT:
-                    otherTile = Tile.CHEST_RIGHT
-                self._performMoveTo(n, direction)
-                self.setTile(pos, Tile.FREE)
-                self.setTile(n, tile)
-                self._performMoveTo(otherHalf.neighbor(direction), direction)
-                self.setTile(otherHalf, Tile.FREE)
-                self.setTile(otherHalf.neighbor(direction), otherTile)
+        self.robot = y * self.width + 2 * x
+        self._updateSteps()
+        self._gpsSum = self._calculateChestGpsSum()
 
     def tryMove(self, command: Command):
         """
         Moves the robot in the given direction, if possible.
-        """
-        next = self.robot.neighbor(command)
-        if self._checkMoveTo(next, command):
-            self._performMoveTo(next, command)
-            self.robot = next
+        All chest cells that would be pushed are collected in a single walk over the frontier, visiting each cell
+        once. If none of them runs into a wall, they are shifted starting with the one furthest ahead.
+        """
+        grid = self._grid
+        step = self._steps[command]
+        vertical = command == Command.UP or command == Command.DOWN
+        target = self.robot + step
+        if grid[target] == FREE:
+            self.robot = target
+            return
+        toMove: list[int] = []
+        seen: set[int] = set()
+        frontier = [target]
+        i = 0
+        while i < len(frontier):
+            cell = frontier[i]
+            i += 1
+            tile = grid[cell]
+            if tile == WALL:
+                return
+            if tile == FREE or cell in seen:
+                continue
+            cells = [cell]
+            if vertical and tile == CHEST_LEFT:
+                cells.append(cell + 1)
+            if vertical and tile == CHEST_RIGHT:
+                cells.append(cell - 1)
+            for c in cells:
+                if not c in seen:
+                    seen.add(c)
+                    toMove.append(c)
+                    frontier.append(c + step)
+        # cells are found in order of their distance, so the furthest ones are moved first
+        chests = 0
+        for cell in reversed(toMove):
+            tile = grid[cell]
+            if tile == CHEST_FULL or tile == CHEST_LEFT:
+                chests += 1
+            grid[cell + step] = tile
+            grid[cell] = FREE
+        self._gpsSum += chests * (100 if vertical else 1) * (1 if step > 0 else -1)
+        self.robot = target
 
     def getChestGpsSum(self):
         """
-        Returns the sum of all chest GPSs.
+        Returns the sum of all chest GPSs. The sum is kept up to date while chests are moved.
+        """
+        return self._gpsSum
+
+    def _calculateChestGpsSum(self):
+        """
+        Calculates the sum of all chest GPSs by going through the whole map.
         """
         sum = 0
-        for y in range(self.height):
-            for x in range(self.width):
-                if self._data[y][x] == Tile.CHEST_FULL or self._data[y][x] == Tile.CHEST_LEFT:
-                    sum += 100 * y + x
+        for i in range(len(self._grid)):
+            if self._grid[i] == CHEST_FULL or self._grid[i] == CHEST_LEFT:
+                y, x = divmod(i, self.width)
+                sum += 100 * y + x
         return sum
 
+COMMANDS = {
+    "^": Command.UP,
+    "v": Command.DOWN,
+    "<": Command.LEFT,
+    ">": Command.RIGHT,
+}
+
+class CommandStream:
+    def __init__(self, filename: str, chunkSize = 1 << 16) -> None:
+        """
+        Creates a stream of the commands in the given input file. The commands are read lazily in chunks
+        every time the stream is iterated, so memory stays flat no matter how long the command log is.
+        """
+        self.filename = filename
+        self.chunkSize = chunkSize
+
+    def __iter__(self) -> Iterator[Command]:
+        """
+        Yields the commands after the map section one by one.
+        """
+        with open("2024/Day15/" + self.filename + ".txt", "r") as data:
+            for line in data:
+                if line == "\n":
+                    break
+            while True:
+                chunk = data.read(self.chunkSize)
+                if chunk == "":
+                    break
+                for c in chunk:
+                    if c in COMMANDS:
+                        yield COMMANDS[c]
+
 def readInput(filename: str):
     """
-    Parses the input file.
+    Parses the map section of the input file. The commands are returned as a stream which reads them lazily.
     """
     data = open("2024/Day15/" + filename + ".txt", "r")
-    lines = data.readlines()
     mapStrings = []
-    commandStrings = []
-    for i in range(len(lines)):
-        if lines[i] == "\n":
-            mapStrings = lines[:i]
-            commandStrings = lines[i:]
+    for line in data:
+        if line == "\n":
+            break
+        mapStrings.append(line)
+    data.close()
     map = Map(mapStrings)
     wideMap = Map(mapStrings)
     wideMap.convertToWideVersion()
-    commands: list[Command] = []
-    for r in commandStrings:
-        for c in r:
-            if c == "^":
-                commands.append(Command.UP)
-            if c == "v":
-                commands.append(Command.DOWN)
-            if c == "<":
-                commands.append(Command.LEFT)
-            if c == ">":
-                commands.append(Command.RIGHT)
-    return (map, wideMap, commands)
-
-def solveTask(m: Map, commands: list[Command]):
+    return (map, wideMap, CommandStream(filename))
+
+def solveTask(m: Map, commands: Iterable[Command]):
     """
     Solves the task by simulating the robot and fetching all chest positions.
     """
@@ -210,6 +189,7 @@ def solveTask(m: Map, commands: list[Command]):
         m.tryMove(c)
     print(m.getChestGpsSum())
 
-m, wideMap, commands = readInput("input")
-solveTask(m, commands)
-solveTask(wideMap, commands)
+if __name__ == "__main__":
+    m, wideMap, commands = readInput("input")
+    solveTask(m, commands)
+    solveTask(wideMap, commands)
@@ -1,3 +1,4 @@
+import heapq
 from enum import Enum
 
 class Direction(Enum):
@@ -6,12 +7,6 @@ class Direction(Enum):
     DOWN = 2
     LEFT = 3
 
-    def isHorizontal(self):
-        return self == Direction.RIGHT or self == Direction.LEFT
-    
-    def isCorner(self, other):
-        return self.isHorizontal() != other.isHorizontal()
-
 class Pos:
     def __init__(self, x: int, y: int) -> None:
         """
@@ -39,59 +34,70 @@ class Pos:
         Returns a human readable form.
         """
         return f"({self.x}, {self.y})"
-    
-    def getNeighbors(self):
-        """
-        Returns all neighbors and the direction towards them.
-        """
-        return [
-            (Pos(self.x, self.y - 1), Direction.UP),
-            (Pos(self.x, self.y + 1), Direction.DOWN),
-            (Pos(self.x - 1, self.y), Direction.LEFT),
-            (Pos(self.x + 1, self.y), Direction.RIGHT),
-        ]
-
-class Node:
-    def __init__(self, pos: Pos, dir: Direction, cost: int) -> None:
-        """
-        Creates a new node.
-        """
-        self.position = pos
-        self.direction = dir
-        self.cost = cost
-
-    def __repr__(self) -> str:
-        """
-        Returns a human readable form.
-        """
-        return f"({self.position}, {self.direction}, {self.cost})"
 
 class Map:
     def __init__(self, input: list[str]) -> None:
         """
-        Creates a new map by parsing the input.
+        Creates a new map by parsing the input. The walkable cells are stored row by row in a flat list.
         """
         self.height = len(input)
         self.width = len(input[0]) - 1
-        data: list[list[bool]] = []
+        data: list[bool] = []
         for y in range(self.height):
-            data.append([])
             for x in range(self.width):
                 char = input[y][x]
-                data[y].append(char != "#")
+                data.append(char != "#")
                 if char == "E":
                     self.exit = Pos(x, y)
                 if char == "S":
                     self.start = Pos(x, y)
         self._data = data
+        # offsets of the neighboring cell in the order of the direction values
+        self.steps = [-self.width, 1, self.width, -1]
 
     def isWalkable(self, pos: Pos):
         """
         Checks if the given position is walkable.
         """
-        return self._data[pos.y][pos.x]
-    
-PredMap = dict[tuple[Pos, Direction], list[tuple[Pos, Direction]]]
+        return self._data[self.getCell(pos)]
+
+    def getCell(self, pos: Pos):
+        """
+        Returns the index of the given position in the flat grid.
+        """
+        return pos.y * self.width + pos.x
+
+    def getStateCount(self):
+        """
+        Returns the number of (cell, direction) states of the map.
+        """
+        return 4 * len(self._data)
+
+    def getMoves(self, state: int, reverse = False):
+        """
+        Returns the states reachable from the given state with a single move and the cost of each move.
+        A state is encoded as 4 * cell + direction. If reverse is set, the states from which the given
+        state can be reached are returned instead.
+        """
+        cell, dir = divmod(state, 4)
+        moves = [(state - dir + (dir + 1) % 4, 1000), (state - dir + (dir + 3) % 4, 1000)]
+        if reverse:
+            next = cell - self.steps[dir]
+        else:
+            next = cell + self.steps[dir]
+        if self._data[next]:
+            moves.append((4 * next + dir, 1))
+        return moves
+
+INFINITY = 1 << 62
+
+PredMap = dict[int, list[int]]
+
+def getState(cell: int, dir: Direction):
+    """
+    Encodes a cell and a direction into a single state.
+    """
+    return 4 * cell + dir.value
 
 def readInput(filename: str):
     """
@@ -101,78 +107,145 @@ def readInput(filename: str):
     lines = data.readlines()
     return Map(lines)
 
-def addToCostDictAndQueue(minCost: dict[Pos, dict[Direction, int]], node: Node, queue: list[Node], pred: PredMap, previous: Node | None):
-    """
-    Adds the specific node to the minCost map, the queue and the predecessor map.
-    """
-    if (node.position, node.direction) not in pred:
-        pred[(node.position, node.direction)] = []
-    if node.direction not in minCost[node.position] or minCost[node.position][node.direction] > node.cost:
-        minCost[node.position][node.direction] = node.cost
-        queue.append(node)
-        pred[(node.position, node.direction)] = []
-    if minCost[node.position][node.direction] == node.cost and previous != None:
-        pred[(node.position, node.direction)].append((previous.position, previous.direction))
-
-def addAllToCostDictAndQueue(minCost: dict[Pos, dict[Direction, int]], node: Node, queue: list[Node], pred: PredMap, previous: Node | None = None):
+def findCosts(map: Map, starts: list[int], reverse = False, pred: PredMap | None = None):
     """
-    Adds the given node to the minCost map for all directions if it has a lower cost. 
-    Also adds all new nodes to the queue and the predecessor map.
+    Finds the cost of reaching every state from the nearest of the start states using Dijkstra's algorithm.
+    If reverse is set, the moves are followed backwards, so the costs are those of reaching the start states.
+    If a predecessor map is given, the predecessors of every state on its cheapest paths are added to it.
     """
-    if node.position not in minCost:
-        minCost[node.position] = {}
-    addToCostDictAndQueue(minCost, node, queue, pred, previous)
-    for d in [Direction.DOWN, Direction.UP, Direction.LEFT, Direction.RIGHT]:
-        if not d.isCorner(node.direction):
+    costs = [INFINITY] * map.getStateCount()
+    queue = []
+    for state in starts:
+        costs[state] = 0
+        queue.append((0, state))
+    while len(queue) > 0:
+        cost, state = heapq.heappop(queue)
+        if cost > costs[state]:
+            # outdated entry, the state has been settled with a lower cost already
             continue
-        addToCostDictAndQueue(minCost, Node(node.position, d, node.cost + 1000), queue, pred, previous)
+        for next, moveCost in map.getMoves(state, reverse):
+            nextCost = cost + moveCost
+            if nextCost < costs[next]:
+                costs[next] = nextCost
+                heapq.heappush(queue, (nextCost, next))
+                if pred != None:
+                    pred[next] = [state]
+            elif nextCost == costs[next] and pred != None:
+                pred[next].append(state)
+    return costs
 
 def findCostsToAll(map: Map, start: Pos, startDirection: Direction):
     """
     Finds the cost of moving to any position with any direction from the start position.
+    Returns the costs of all states and the predecessors of every state on its cheapest paths.
     """
-    queue: list[Node] = []
-    minCost: dict[Pos, dict[Direction, int]] = {}
     pred: PredMap = {}
-    addAllToCostDictAndQueue(minCost, Node(start, startDirection, 0), queue, pred)
+    costs = findCosts(map, [getState(map.getCell(start), startDirection)], pred=pred)
+    return (costs, pred)
+
+def estimateCost(map: Map, state: int, target: Pos):
+    """
+    Returns a lower bound of the cost from the given state to the target: the Manhattan distance plus
+    1000 for every turn that can not be avoided given the current direction.
+    """
+    cell, dir = divmod(state, 4)
+    y, x = divmod(cell, map.width)
+    dx = target.x - x
+    dy = target.y - y
+    needed: list[int] = []
+    if dx != 0:
+        needed.append(Direction.RIGHT.value if dx > 0 else Direction.LEFT.value)
+    if dy != 0:
+        needed.append(Direction.DOWN.value if dy > 0 else Direction.UP.value)
+    turns = 0
+    if len(needed) == 1:
+        if dir == needed[0]:
+            turns = 0
+        elif (dir - needed[0]) % 2 == 1:
+            turns = 1
+        else:
+            turns = 2
+    elif len(needed) == 2:
+        # facing one of the needed directions requires a single turn to the other one,
+        # facing away from one of them requires turning to the other one first and back later
+        turns = 1 if dir in needed else 2
+    return abs(dx) + abs(dy) + 1000 * turns
+
+def findShortestPathLength(map: Map, start: Pos, startDirection: Direction):
+    """
+    Finds the length of the shortest path from the start to the exit using A*.
+    The search stops as soon as the exit is settled, so only a part of the states is expanded.
+    """
+    exit = map.getCell(map.exit)
+    costs = [INFINITY] * map.getStateCount()
+    startState = getState(map.getCell(start), startDirection)
+    costs[startState] = 0
+    queue = [(estimateCost(map, startState, map.exit), 0, startState)]
     while len(queue) > 0:
-        current = queue.pop(0)
-        neighbors = current.position.getNeighbors()
-        for n, d in neighbors:
-            if not map.isWalkable(n):
-                continue
-            if d == current.direction:
-                addAllToCostDictAndQueue(minCost, Node(n, d, current.cost + 1), queue, pred, current)
-    return (minCost, pred)
-
-def findPositionsOnPaths(pred: PredMap, end: Pos, minCost: dict[Pos, dict[Direction, int]], pathLength: int):
-    """
-    Finds all positions on all shortest paths.
-    """
-    positions: set[Pos] = set()
-    queue: list[tuple[Pos, Direction]] = []
-    for d in [Direction.DOWN, Direction.UP, Direction.LEFT, Direction.RIGHT]:
-        if minCost[end][d] == pathLength:
-            queue.append((end, d))
+        _, cost, state = heapq.heappop(queue)
+        if cost > costs[state]:
+            continue
+        if state // 4 == exit:
+            return cost
+        for next, moveCost in map.getMoves(state):
+            nextCost = cost + moveCost
+            if nextCost < costs[next]:
+                costs[next] = nextCost
+                heapq.heappush(queue, (nextCost + estimateCost(map, next, map.exit), nextCost, next))
+    return None
+
+def findPositionsOnPaths(pred: PredMap, end: int, costs: list[int], pathLength: int):
+    """
+    Finds all cells on all shortest paths to the given end cell.
+    """
+    queue: list[int] = []
+    for d in Direction:
+        state = getState(end, d)
+        if costs[state] == pathLength:
+            queue.append(state)
+    seen = set(queue)
     while len(queue) > 0:
-        pos, dir = queue.pop(0)
-        positions.add(pos)
-        for option in pred[(pos, dir)]:
-            queue.append(option)
-    return positions
+        state = queue.pop()
+        for option in pred.get(state, []):
+            if option not in seen:
+                seen.add(option)
+                queue.append(option)
+    return set(state // 4 for state in seen)
 
 def solveTasks(map: Map):
-    startCosts, pred = findCostsToAll(map, map.start, Direction.RIGHT)
-    minLength = 100000
-    for dir in startCosts[map.exit]:
-        v = startCosts[map.exit][dir]
-        if v < minLength:
-            minLength = v
+    costs, pred = findCostsToAll(map, map.start, Direction.RIGHT)
+    exit = map.getCell(map.exit)
+    minLength = min(costs[getState(exit, d)] for d in Direction)
     print("shortest path length:", minLength)
-    positions = findPositionsOnPaths(pred, map.exit, startCosts, minLength)
+    positions = findPositionsOnPaths(pred, exit, costs, minLength)
     print("number of positions on path:", len(positions))
 
-map = readInput("input")
-solveTasks(map)
+def findPositionsOnPathsBidirectional(map: Map, start: Pos, startDirection: Direction):
+    """
+    Finds the length of the shortest paths to the exit and all cells on them without a predecessor map.
+    A state lies on a shortest path if its cost from the start and its cost to the exit add up to the length.
+    """
+    exitStates = [getState(map.getCell(map.exit), d) for d in Direction]
+    forward = findCosts(map, [getState(map.getCell(start), startDirection)])
+    pathLength = min(forward[state] for state in exitStates)
+    backward = findCosts(map, exitStates, reverse=True)
+    positions: set[int] = set()
+    for state in range(len(forward)):
+        if forward[state] + backward[state] == pathLength:
+            positions.add(state // 4)
+    return (pathLength, positions)
+
+def solveTasksBidirectional(map: Map):
+    minLength, positions = findPositionsOnPathsBidirectional(map, map.start, Direction.RIGHT)
+    print("shortest path length:", minLength)
+    print("number of positions on path:", len(positions))
+
+def solveTasksAStar(map: Map):
+    """
+    Only finds the shortest path length, which does not require exploring the whole maze.
+    """
+    print("shortest path length:", findShortestPathLength(map, map.start, Direction.RIGHT))
 
-    
\ No newline at end of file
+if __name__ == "__main__":
+    map = readInput("input")
+    solveTasks(map)
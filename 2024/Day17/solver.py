@@ -1,3 +1,103 @@
+COMBO_OPERANDS = ["0", "1", "2", "3", "a", "b", "c"]
+
+def getComboExpression(op: int) -> str:
+    """
+    Returns the python expression of the given combo operand.
+    """
+    if op >= 0 and op <= 6:
+        return COMBO_OPERANDS[op]
+    raise ValueError("Unexpected operand in combo operand resolver.")
+
+def compileInstruction(instr: int, operand: int) -> str:
+    """
+    Returns the python statement that executes the given instruction.
+    An invalid combo operand is only reported when the instruction is actually executed.
+    """
+    if instr == 1:
+        return f"b ^= {operand}"
+    if instr == 4:
+        return "b ^= c"
+    if operand == 7:
+        return "raise ValueError(\"Unexpected operand in combo operand resolver.\")"
+    combo = getComboExpression(operand)
+    if instr == 0:
+        return f"a = a >> {combo}"
+    if instr == 2:
+        return f"b = {combo} & 7"
+    if instr == 5:
+        return f"yield {combo} & 7"
+    if instr == 6:
+        return f"b = a >> {combo}"
+    if instr == 7:
+        return f"c = a >> {combo}"
+    raise ValueError(f"Unexpected instruction {instr}.")
+
+def compileBlock(program: list[int], start: int, leaders: set[int]) -> tuple[list[str], int | None]:
+    """
+    Compiles the instructions from start up to the next jump, block start or the end of the program.
+    Returns the statements and the address of the instruction that follows the block.
+    If the block ends with a jump, the returned address is None and the last statement sets the program counter.
+    """
+    lines: list[str] = []
+    pc = start
+    while pc + 1 < len(program):
+        instr = program[pc]
+        operand = program[pc + 1]
+        if instr == 3:
+            lines.append(f"pc = {operand} if a != 0 else {pc + 2}")
+            return (lines, None)
+        lines.append(compileInstruction(instr, operand))
+        pc += 2
+        if pc in leaders:
+            break
+    return (lines, pc)
+
+def compileProgram(program: list[int]):
+    """
+    Compiles the program into a python generator function which takes the register values and yields the output.
+    Jump targets are literals, so the program can be split into blocks of straight line code.
+    The usual shape of a single loop which jumps back to the start becomes a plain while loop,
+    everything else switches between the blocks with a program counter.
+    """
+    leaders = set([0])
+    for pc in range(0, len(program) - 1, 2):
+        if program[pc] == 3:
+            leaders.add(program[pc + 1])
+    # jump targets of odd instructions are only found once the block that contains them is compiled
+    blocks: dict[int, list[str]] = {}
+    pending = [0]
+    while len(pending) > 0:
+        start = pending.pop()
+        if start in blocks or start + 1 >= len(program):
+            continue
+        lines, next = compileBlock(program, start, leaders)
+        if next == None:
+            jump = program[start + 2 * len(lines) - 1]
+            leaders.add(jump)
+            pending.extend([jump, start + 2 * len(lines)])
+        else:
+            lines.append(f"pc = {next}")
+            pending.append(next)
+        blocks[start] = lines
+    # makes it a generator even if the program has no out instruction
+    source = ["def run(a, b, c):", "    yield from ()"]
+    if list(blocks) == [0] and blocks[0][-1] == f"pc = 0 if a != 0 else {len(program)}":
+        source.append("    while True:")
+        source.extend("        " + line for line in blocks[0][:-1])
+        source.append("        if a == 0:")
+        source.append("            return")
+    else:
+        source.append("    pc = 0")
+        source.append("    while True:")
+        for start in sorted(blocks):
+            source.append(f"        if pc == {start}:")
+            source.extend("            " + line for line in blocks[start])
+            source.append("            continue")
+        source.append("        return")
+    namespace: dict = {}
+    exec("\n".join(source), namespace)
+    return namespace["run"]
+
 class Machine:
     def __init__(self, a: int, b: int, c: int, program: list[int]) -> None:
         """
@@ -5,6 +105,7 @@ class Machine:
         """
         self.reset(a, b, c)
         self.program = program
+        self._compiled = compileProgram(program)
 
     def reset(self, a: int, b: int, c: int):
         self.programCounter = 0
@@ -31,25 +132,19 @@ class Machine:
         """
         Executes a-division instruction.
         """
-        numerator = self.regA
-        denumerator = 2 ** self.resolveComboOperand(operand)
-        self.regA = int(numerator / denumerator)
+        self.regA = self.regA >> self.resolveComboOperand(operand)
 
     def runBDV(self, operand: int):
         """
         Executes b-division instruction.
         """
-        numerator = self.regA
-        denumerator = 2 ** self.resolveComboOperand(operand)
-        self.regB = int(numerator / denumerator)
+        self.regB = self.regA >> self.resolveComboOperand(operand)
 
     def runCDV(self, operand: int):
         """
         Executes c-division instruction.
         """
-        numerator = self.regA
-        denumerator = 2 ** self.resolveComboOperand(operand)
-        self.regC = int(numerator / denumerator)
+        self.regC = self.regA >> self.resolveComboOperand(operand)
 
     def runBXL(self, operand: int):
         """
@@ -86,6 +181,24 @@ class Machine:
         self.regB = self.resolveComboOperand(operand) % 8
 
     def run(self):
+        """
+        Runs the compiled program with the current register values and returns the output.
+        """
+        self.output = list(self.stream())
+        return self.output
+
+    def stream(self):
+        """
+        Runs the compiled program with the current register values and yields the output values one by one.
+        The program only runs as far as the output is consumed.
+        """
+        return self._compiled(self.regA, self.regB, self.regC)
+
+    def interpret(self):
+        """
+        Runs the program instruction by instruction. Slower than run, but the registers and the
+        program counter reflect the state of the machine afterwards.
+        """
         while True:
             if self.programCounter >= len(self.program):
                 break
@@ -131,6 +244,34 @@ def solveTask1(machine: Machine):
     outStr = list(map(str, output))
     print(",".join(outStr))
 
+def matchesOutput(machine: Machine, a: int, target: list[int]):
+    """
+    Checks if the program outputs exactly the target when started with the given value in register a.
+    The program is stopped as soon as an output value differs from the target.
+    """
+    machine.reset(a, 0, 0)
+    i = 0
+    for value in machine.stream():
+        if i >= len(target) or value != target[i]:
+            return False
+        i += 1
+    return i == len(target)
+
+def findMinimalA(machine: Machine, aVal: int, offset: int):
+    """
+    Returns the smallest value for register a which starts with the given octal digits and makes the program
+    output itself, or None if there is none.
+    """
+    result = None
+    if matchesOutput(machine, aVal, machine.program):
+        result = aVal
+    elif offset == 0 or matchesOutput(machine, aVal, machine.program[-offset:]):
+        for n in range(8):
+            candidate = findMinimalA(machine, 8 * aVal + n, offset + 1)
+            if candidate != None and (result == None or candidate < result):
+                result = candidate
+    return result
+
 def solveTask2(machine: Machine, aVal: int, offset: int):
     """
     Solves the second task.
@@ -139,21 +280,12 @@ def solveTask2(machine: Machine, aVal: int, offset: int):
     When a matching number is found, the number is shifted left by 3 bits (by multiplying with 8) and the 
     process is repeated with the second to last number in the program.
     """
-    machine.reset(aVal, 0, 0)
-    output = machine.run()
-    if output == machine.program:
-        return aVal
-    if output == machine.program[-offset:] or offset == 0:
-        minResult = 999999999999999
-        for n in range(8):
-            result = solveTask2(machine, 8 * aVal + n, offset + 1)
-            if result != None:
-                minResult = min(result, minResult)
-        if offset == 0:
-            print(minResult)
-        return minResult
-
-machine = readInput("input")
-solveTask1(machine)
-solveTask2(machine, 0, 0)
+    result = findMinimalA(machine, aVal, offset)
+    if offset == 0:
+        print(result)
+    return result
 
+if __name__ == "__main__":
+    machine = readInput("input")
+    solveTask1(machine)
+    solveTask2(machine, 0, 0)
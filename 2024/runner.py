@@ -0,0 +1,218 @@
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import re
+import sys
+import time
+import tracemalloc
+from types import ModuleType
+from typing import Any, Callable
+
+YEAR_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(YEAR_DIR)
+
+Task = tuple[str, Callable[[tuple], Any]]
+
+class Measurement:
+    def __init__(self, phase: str, wall: float, cpu: float, peak: int | None) -> None:
+        """
+        Creates a new measurement of a single phase. Times are in seconds, the peak memory in bytes.
+        """
+        self.phase = phase
+        self.wall = wall
+        self.cpu = cpu
+        self.peak = peak
+
+    def merge(self, other):
+        """
+        Combines two measurements of the same phase by keeping the best times and the highest peak.
+        """
+        peak = self.peak
+        if other.peak != None:
+            peak = max(peak or 0, other.peak)
+        return Measurement(self.phase, min(self.wall, other.wall), min(self.cpu, other.cpu), peak)
+
+def findDays() -> list[int]:
+    """
+    Returns the numbers of all days that have a solver.
+    """
+    days = []
+    for name in os.listdir(YEAR_DIR):
+        match = re.fullmatch("Day(\\d+)", name)
+        if match and os.path.isfile(os.path.join(YEAR_DIR, name, "solver.py")):
+            days.append(int(match.group(1)))
+    return sorted(days)
+
+def loadSolver(day: int) -> ModuleType:
+    """
+    Imports the solver of the given day without running its main block.
+    The solver is imported as the module DayNN.solver from the year directory. Worker processes of
+    parallel solvers which are spawned instead of forked import it again by that name.
+    """
+    path = os.path.join(YEAR_DIR, f"Day{day:02d}", "solver.py")
+    if not os.path.isfile(path):
+        raise ImportError(f"Solver for day {day} can not be loaded.")
+    if YEAR_DIR not in sys.path:
+        # spawned processes get the same search path, so they can import the solver as well
+        sys.path.insert(0, YEAR_DIR)
+    return importlib.import_module(f"Day{day:02d}.solver")
+
+def getVariant(solver: ModuleType, name: str, variant: str) -> Callable:
+    """
+    Returns the given variant of a solver function, e.g. solveTask1Vectorized for the variant Vectorized.
+    Falls back to the plain function if the solver has no such variant.
+    """
+    return getattr(solver, name + variant, getattr(solver, name))
+
+def getDefaultTasks(solver: ModuleType, variant: str) -> list[Task]:
+    """
+    Returns the tasks of a solver that follows the usual solveTask1/solveTask2 or solveTasks convention.
+    Every task is called with the parsed input as arguments.
+    """
+    tasks: list[Task] = []
+    for name in ["solveTask1", "solveTask2", "solveTasks"]:
+        if hasattr(solver, name):
+            fn = getVariant(solver, name, variant)
+            tasks.append((fn.__name__, lambda data, fn=fn: fn(*data)))
+    return tasks
+
+def getRobotGridSize(filename: str) -> tuple[int, int]:
+    """
+    Returns the size of the robot grid of day 14, which differs between the example and the real input.
+    """
+    if filename == "test":
+        return (11, 7)
+    return (101, 103)
+
+def getRobotTasks(solver: ModuleType, filename: str, variant: str) -> list[Task]:
+    """
+    Returns the tasks of day 14, which also take the size of the robot grid.
+    """
+    width, height = getRobotGridSize(filename)
+    tasks: list[Task] = []
+    for name in ["solveTask1", "solveTask2"]:
+        fn = getVariant(solver, name, variant)
+        tasks.append((fn.__name__, lambda data, fn=fn: fn(*data, width, height)))
+    return tasks
+
+def getWarehouseTasks(solver: ModuleType, filename: str, variant: str) -> list[Task]:
+    """
+    Returns the tasks of day 15, which run the same commands on the narrow and the wide map.
+    """
+    fn = getVariant(solver, "solveTask", variant)
+    return [
+        (fn.__name__, lambda data, fn=fn: fn(data[0], data[2])),
+        (fn.__name__ + " (wide)", lambda data, fn=fn: fn(data[1], data[2])),
+    ]
+
+def getComputerTasks(solver: ModuleType, filename: str, variant: str) -> list[Task]:
+    """
+    Returns the tasks of day 17, where the second task starts its search with an empty register value.
+    """
+    task1 = getVariant(solver, "solveTask1", variant)
+    task2 = getVariant(solver, "solveTask2", variant)
+    return [
+        (task1.__name__, lambda data, fn=task1: fn(*data)),
+        (task2.__name__, lambda data, fn=task2: fn(*data, 0, 0)),
+    ]
+
+SPECIAL_TASKS: dict[int, Callable[[ModuleType, str, str], list[Task]]] = {
+    14: getRobotTasks,
+    15: getWarehouseTasks,
+    17: getComputerTasks,
+}
+
+def getTasks(day: int, solver: ModuleType, filename: str, variant: str) -> list[Task]:
+    """
+    Returns the tasks of the given day.
+    """
+    if day in SPECIAL_TASKS:
+        return SPECIAL_TASKS[day](solver, filename, variant)
+    return getDefaultTasks(solver, variant)
+
+def measure(phase: str, fn: Callable, traceMemory: bool, *args) -> tuple[Any, Measurement]:
+    """
+    Runs the given function and measures wall time, CPU time and, if traceMemory is set, the peak memory
+    allocated while it runs. Tracing memory slows down allocation-heavy code, so the times are only
+    comparable between runs with the same setting. Both the CPU time and the peak memory only cover the
+    current process, so they leave out the work of parallel solvers that runs in worker processes.
+    """
+    if traceMemory:
+        tracemalloc.start()
+    wallStart = time.perf_counter()
+    cpuStart = time.process_time()
+    result = fn(*args)
+    cpu = time.process_time() - cpuStart
+    wall = time.perf_counter() - wallStart
+    peak = None
+    if traceMemory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return (result, Measurement(phase, wall, cpu, peak))
+
+def asArguments(data: Any) -> tuple:
+    """
+    Converts the result of readInput into the arguments of the solve functions.
+    """
+    if isinstance(data, tuple):
+        return data
+    return (data,)
+
+def runDay(day: int, filename: str, variant = "", traceMemory = True) -> list[Measurement]:
+    """
+    Parses the input and runs all tasks of the given day, measuring each phase separately.
+    The tasks may change the parsed data, so every task after the first gets a freshly parsed copy
+    which is not part of the measurements.
+    """
+    solver = loadSolver(day)
+    readInput = getVariant(solver, "readInput", variant)
+    data, parsing = measure(readInput.__name__, readInput, traceMemory, filename)
+    measurements = [parsing]
+    for i, (name, task) in enumerate(getTasks(day, solver, filename, variant)):
+        if i > 0:
+            data = readInput(filename)
+        _, m = measure(name, task, traceMemory, asArguments(data))
+        measurements.append(m)
+    return measurements
+
+def formatMeasurements(day: int, measurements: list[Measurement]) -> str:
+    """
+    Formats the measurements of a day as a table.
+    """
+    lines = [f"Day{day:02d}  {'phase':<20}{'wall ms':>12}{'cpu ms':>12}{'peak KiB':>12}"]
+    for m in measurements:
+        peak = "-" if m.peak == None else f"{m.peak / 1024:.1f}"
+        lines.append(f"       {m.phase:<20}{m.wall * 1000:>12.2f}{m.cpu * 1000:>12.2f}{peak:>12}")
+    return "\n".join(lines)
+
+def benchmark(day: int, filename: str, variant = "", repeat = 1, traceMemory = True) -> list[Measurement]:
+    """
+    Runs the given day repeatedly and returns the best measurement of each phase.
+    Only the output of the first run is shown.
+    """
+    best = runDay(day, filename, variant, traceMemory)
+    for _ in range(repeat - 1):
+        with contextlib.redirect_stdout(io.StringIO()):
+            measurements = runDay(day, filename, variant, traceMemory)
+        best = [b.merge(m) for b, m in zip(best, measurements)]
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs the solvers and measures parsing and every task separately.")
+    parser.add_argument("days", nargs="*", type=int, help="days to run, all days if omitted")
+    parser.add_argument("--input", default="input", help="name of the input file without extension, e.g. test")
+    parser.add_argument("--variant", default="", help="suffix of alternative solver functions, e.g. Vectorized")
+    parser.add_argument("--repeat", type=int, default=1, help="number of runs, the best time is reported")
+    parser.add_argument("--no-memory", action="store_true", help="do not trace the peak memory")
+    args = parser.parse_args()
+    # the solvers open their input relative to the repository root
+    os.chdir(ROOT_DIR)
+    days = args.days or findDays()
+    for day in days:
+        measurements = benchmark(day, args.input, args.variant, max(1, args.repeat), not args.no_memory)
+        print(formatMeasurements(day, measurements), flush=True)
+
+if __name__ == "__main__":
+    main()